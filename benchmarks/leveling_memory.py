@@ -0,0 +1,61 @@
+# Compares the memory used by leveling member records stored as the old
+# {"member_id": {"xp": ..., "level": ...}} dicts against MemberTable, alone and
+# with the RankIndex every guild gets once /level, /rank or /leaderboard is used.
+#
+#   python -m benchmarks.leveling_memory [members ...]
+import random
+import sys
+import tracemalloc
+from utils.membertable import MemberTable
+from utils.ranking import RankIndex
+
+DEFAULT_SIZES = (100_000, 1_000_000, 5_000_000)
+
+
+def fake_members(count):
+    rng = random.Random(count)
+    base = 100_000_000_000_000_000
+    for i in range(count):
+        yield base + i * 7919, rng.randint(0, 500), rng.randint(1, 60)
+
+
+def measure(build):
+    tracemalloc.start()
+    data = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del data
+    return size
+
+
+def build_dicts(count):
+    return {str(member_id): {"xp": xp, "level": level} for member_id, xp, level in fake_members(count)}
+
+
+def build_table(count):
+    return MemberTable(fake_members(count))
+
+
+def build_ranked_table(count):
+    table = MemberTable(fake_members(count))
+    return table, RankIndex(table.items())
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    print(
+        f"{'members':>10} {'dict of dicts':>15} {'MemberTable':>15} {'+ RankIndex':>15} "
+        f"{'bytes/member':>22} {'saved':>7}"
+    )
+    for count in sizes:
+        dicts = measure(lambda: build_dicts(count))
+        table = measure(lambda: build_table(count))
+        ranked = measure(lambda: build_ranked_table(count))
+        print(
+            f"{count:>10} {dicts / 2**20:>12.1f} MB {table / 2**20:>12.1f} MB {ranked / 2**20:>12.1f} MB "
+            f"{dicts / count:>7.0f} -> {table / count:<4.0f} / {ranked / count:<4.0f} {1 - ranked / dicts:>6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Times the welcome card before and after caching its static layers.
+#
+#   python -m benchmarks.welcome_card [renders]
+import io
+import sys
+import time
+from PIL import Image, ImageDraw, ImageFont
+from config import FONT_PATH, FONT_SIZE, BACKGROUND_IMAGE, HEADS_IMAGE
+from utils.cards import compose_welcome_card
+
+
+def legacy_welcome_card(avatar_bytes, text):
+    # Events.create_image as it was, minus the avatar download and the PNG encode
+    avatar_size = 400
+    avatar_img = Image.open(io.BytesIO(avatar_bytes)).convert("RGBA")
+    avatar_resized = avatar_img.resize((avatar_size, avatar_size), Image.LANCZOS)
+
+    mask = Image.new("L", (avatar_size, avatar_size), 0)
+    draw_mask = ImageDraw.Draw(mask)
+    draw_mask.ellipse((0, 0, avatar_size, avatar_size), fill=255)
+
+    avatar_circle = Image.new("RGBA", (avatar_size, avatar_size))
+    avatar_circle.paste(avatar_resized, (0, 0), mask)
+
+    background = Image.open(BACKGROUND_IMAGE).convert("RGBA").resize((1280, 720))
+
+    border_size = 12
+    contour_size = avatar_size + border_size * 2
+    contour = Image.new("RGBA", (contour_size, contour_size), (255, 255, 255, 0))
+    contour_draw = ImageDraw.Draw(contour)
+    contour_draw.ellipse(
+        (0, 0, contour_size - 1, contour_size - 1),
+        outline=(255, 255, 255, 255),
+        width=border_size
+    )
+
+    avatar_pos = (border_size, border_size)
+    contour.paste(avatar_circle, avatar_pos, avatar_circle)
+
+    contourX = (1280 - contour_size) // 2
+    contourY = (720 - contour_size) // 2 - 60
+    background.paste(contour, (contourX, contourY), contour)
+
+    draw = ImageDraw.Draw(background)
+    font = ImageFont.truetype(FONT_PATH, FONT_SIZE)
+
+    text_bbox = draw.textbbox((0, 0), text, font=font)
+    textX = (1280 - (text_bbox[2] - text_bbox[0])) // 2
+    textY = contourY + contour_size + 40
+
+    draw.text((textX, textY), text, font=font, fill=(255, 255, 255))
+    return background
+
+
+def encoded(compose):
+    def render(avatar_bytes, text):
+        output = io.BytesIO()
+        compose(avatar_bytes, text).save(output, "PNG")
+        return output.getvalue()
+    return render
+
+
+def sample_avatar():
+    output = io.BytesIO()
+    Image.open(HEADS_IMAGE).convert("RGBA").resize((512, 512)).save(output, "PNG")
+    return output.getvalue()
+
+
+def time_renders(render, avatar_bytes, renders):
+    render(avatar_bytes, "Warm up")
+    timings = []
+    for i in range(renders):
+        start = time.perf_counter()
+        render(avatar_bytes, f"Member {i} joined the Server!")
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return sum(timings) / len(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def main():
+    renders = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    avatar_bytes = sample_avatar()
+    cases = (
+        ("before, layers only", legacy_welcome_card),
+        ("after, layers only", compose_welcome_card),
+        ("before, with PNG encode", encoded(legacy_welcome_card)),
+        ("after, with PNG encode", encoded(compose_welcome_card))
+    )
+    for name, render in cases:
+        mean, p95 = time_renders(render, avatar_bytes, renders)
+        print(f"{name:>24}: mean {mean * 1000:7.1f} ms | p95 {p95 * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
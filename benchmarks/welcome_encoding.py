@@ -0,0 +1,45 @@
+# Encode time and upload size of the welcome card for each encoding setting.
+#
+#   python -m benchmarks.welcome_encoding [encodes]
+import sys
+import time
+from utils.cards import compose_welcome_card, encode_image
+from benchmarks.welcome_card import sample_avatar
+
+# (name, format, quality, scale, optimize)
+SETTINGS = (
+    ("PNG", "PNG", None, 1.0, False),
+    ("PNG optimize", "PNG", None, 1.0, True),
+    ("PNG 0.75x", "PNG", None, 0.75, False),
+    ("WebP q85", "WEBP", 85, 1.0, False),
+    ("WebP q85 optimize", "WEBP", 85, 1.0, True),
+    ("WebP q75 0.75x", "WEBP", 75, 0.75, False),
+    ("JPEG q85", "JPEG", 85, 1.0, False),
+    ("JPEG q85 optimize", "JPEG", 85, 1.0, True),
+    ("JPEG q75 0.75x", "JPEG", 75, 0.75, False)
+)
+
+
+def main():
+    encodes = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    card = compose_welcome_card(sample_avatar(), "Member joined the Server!")
+    opaque = card.convert("RGB")
+
+    def encode_old():
+        return encode_image(card, "PNG")
+
+    cases = [("PNG RGBA (before)", encode_old)]
+    for name, format, quality, scale, optimize in SETTINGS:
+        cases.append((name, lambda f=format, q=quality or 85, s=scale, o=optimize: encode_image(opaque, f, q, s, o)))
+
+    for name, encode in cases:
+        size = len(encode())
+        start = time.perf_counter()
+        for _ in range(encodes):
+            encode()
+        mean = (time.perf_counter() - start) / encodes
+        print(f"{name:>20}: {mean * 1000:7.1f} ms | {size / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
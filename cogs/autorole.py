@@ -1,8 +1,7 @@
 import discord
 from discord.ext import commands
-import json
 from colorama import Fore, Style, init
-from config import SERVER_OPTIONS
+from utils.guildconfig import get_guild_config_store
 from typing import Optional
 
 init(autoreset=True)
@@ -10,54 +9,25 @@ init(autoreset=True)
 class AutoRole(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-
-    def load_config(self):
-        try:
-            with open(SERVER_OPTIONS, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-
-    def save_config(self, data):
-        with open(SERVER_OPTIONS, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
-
-    def get_guild_config(self, guild_id):
-        data = self.load_config()
-        return data.get(str(guild_id), {})
-
-    def update_guild_config(self, guild_id, key, value):
-        data = self.load_config()
-        guild_id = str(guild_id)
-        if guild_id not in data:
-            data[guild_id] = {"server_name": "Unknown"}
-        data[guild_id][key] = value
-        self.save_config(data)
+        self.config = get_guild_config_store(bot)
 
     @commands.Cog.listener()
     async def on_guild_update(self, before: discord.Guild, after: discord.Guild):
-        guild_id = str(after.id)
-        data = self.load_config()
-
-        if guild_id in data:
-            if data[guild_id].get("server_name") != after.name:
-                data[guild_id]["server_name"] = after.name
-                self.save_config(data)
+        self.config.update_server_name(after.id, after.name)
 
     @commands.command(name="autorole")
     @commands.has_permissions(administrator=True)
     @commands.guild_only()
     async def autorole(self, ctx: commands.Context, role: Optional[discord.Role] = None):
         guild_id = str(ctx.guild.id)
-        data = self.load_config()
 
         if role and isinstance(role, discord.Role):
             if role.name == "@everyone":
                 await ctx.send("You cannot set @everyone as the automatic role.", delete_after=5)
                 return
 
-            self.update_guild_config(guild_id, "autorole", role.id)
-            self.update_guild_config(guild_id, "server_name", ctx.guild.name)
+            self.config.update_guild_config(guild_id, "autorole", role.id)
+            self.config.update_guild_config(guild_id, "server_name", ctx.guild.name)
 
             await ctx.send(f"The automatic role has been set to: {role.mention}", delete_after=5)
             print(
@@ -67,9 +37,7 @@ class AutoRole(commands.Cog):
             )
 
         elif role is None or (isinstance(role, str) and role.lower() == "clear"):
-            if guild_id in data and "autorole" in data[guild_id]:
-                del data[guild_id]["autorole"]
-                self.save_config(data)
+            if self.config.remove_guild_config(guild_id, "autorole"):
                 await ctx.send("The automatic role has been removed from this server.", delete_after=5)
                 print(
                     f"[AUTOROLE]: Automatic role removed in server {Fore.MAGENTA}{ctx.guild.name}{Style.RESET_ALL} "
@@ -89,7 +57,7 @@ class AutoRole(commands.Cog):
     @commands.Cog.listener()
     async def on_member_join(self, member):
         guild_id = str(member.guild.id)
-        guild_config = self.get_guild_config(guild_id)
+        guild_config = self.config.get_guild_config(guild_id)
         role_id = guild_config.get("autorole")
 
         if role_id:
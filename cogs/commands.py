@@ -2,8 +2,8 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from io import BytesIO
-from PIL import Image
 from config import EMBED_COLOR
+from utils.cards import render_color_banner
 
 class Commands(commands.Cog):
     def __init__(self, bot):
@@ -57,10 +57,8 @@ class Commands(commands.Cog):
                 return
 
             try:
-                banner_image = Image.new("RGB", (600, 200), userColor.to_rgb())
-                image_buffer = BytesIO()
-                banner_image.save(image_buffer, format="PNG")
-                image_buffer.seek(0)
+                # A solid colour PNG takes about a millisecond, queueing it behind other renders could miss the interaction deadline
+                image_buffer = BytesIO(render_color_banner(userColor.to_rgb()))
             except Exception as e:
                 await interaction.response.send_message(
                     f"Error generating banner: {e}", ephemeral=True
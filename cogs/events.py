@@ -1,18 +1,32 @@
 import discord
 from discord.ext import commands
-from PIL import Image, ImageDraw, ImageFont
+import asyncio
 import io
-import requests
 from colorama import Fore, init
 import sys
-from config import FONT_PATH, FONT_SIZE, BACKGROUND_IMAGE, DEBUG_MODE
+from config import DEBUG_MODE, EMBED_COLOR
 from config import BOT_PRESENCE, GAME_NAME_PRESENCE, STREAM_NAME_PRESENCE, STREAM_URL_PRESENCE, SONG_NAME_PRESENCE, MOVIE_NAME_PRESENCE
+from config import WELCOME_BURST_THRESHOLD, WELCOME_BURST_WINDOW, WELCOME_BATCH_INTERVAL, WELCOME_BATCH_MODE, WELCOME_COLLAGE_MAX
+from utils.cards import render_welcome_card, render_join_collage, welcome_image_filename
+from utils.web import get_web_client
+from utils.render import get_render_service, PRIORITY_CARDS
+from utils.joinburst import JoinBurstTracker
 
 init(autoreset=True)
 
 class Events(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.web = get_web_client(bot)
+        self.renderer = get_render_service(bot)
+        self.join_bursts = JoinBurstTracker(WELCOME_BURST_THRESHOLD, WELCOME_BURST_WINDOW)
+        # guild_id -> members waiting for the next batched welcome while a server is being raided
+        self.pending_joins = {}
+        self.batch_tasks = {}
+
+    def cog_unload(self):
+        for task in self.batch_tasks.values():
+            task.cancel()
 
     @commands.Cog.listener()
     async def on_ready(self):
@@ -62,53 +76,10 @@ class Events(commands.Cog):
 
     async def create_image(self, member, text):
         # ALWAYS valid in discord.py 2.4.0 (handles default avatars)
-        avatar_url = member.display_avatar.replace(format="png", size=512).url
-        avatar_size = 400
-
-        avatar_bytes = requests.get(avatar_url).content
-        avatar_img = Image.open(io.BytesIO(avatar_bytes)).convert("RGBA")
-        avatar_resized = avatar_img.resize((avatar_size, avatar_size), Image.LANCZOS)
-
-        # Create circular mask
-        mask = Image.new("L", (avatar_size, avatar_size), 0)
-        draw_mask = ImageDraw.Draw(mask)
-        draw_mask.ellipse((0, 0, avatar_size, avatar_size), fill=255)
-
-        avatar_circle = Image.new("RGBA", (avatar_size, avatar_size))
-        avatar_circle.paste(avatar_resized, (0, 0), mask)
-
-        background = Image.open(BACKGROUND_IMAGE).convert("RGBA").resize((1280, 720))
-
-        border_size = 12
-        contour_size = avatar_size + border_size * 2
-        contour = Image.new("RGBA", (contour_size, contour_size), (255, 255, 255, 0))
-        contour_draw = ImageDraw.Draw(contour)
-        contour_draw.ellipse(
-            (0, 0, contour_size - 1, contour_size - 1),
-            outline=(255, 255, 255, 255),
-            width=border_size
-        )
-
-        avatar_pos = (border_size, border_size)
-        contour.paste(avatar_circle, avatar_pos, avatar_circle)
-
-        contourX = (1280 - contour_size) // 2
-        contourY = (720 - contour_size) // 2 - 60
-        background.paste(contour, (contourX, contourY), contour)
-
-        draw = ImageDraw.Draw(background)
-        font = ImageFont.truetype(FONT_PATH, FONT_SIZE)
+        avatar_bytes = await self.web.fetch_avatar(member.display_avatar, size=512, format="png")
 
-        text_bbox = draw.textbbox((0, 0), text, font=font)
-        textX = (1280 - (text_bbox[2] - text_bbox[0])) // 2
-        textY = contourY + contour_size + 40
-
-        draw.text((textX, textY), text, font=font, fill=(255, 255, 255))
-
-        with io.BytesIO() as img:
-            background.save(img, "PNG")
-            img.seek(0)
-            return discord.File(img, "output.png")
+        image = await self.renderer.render(render_welcome_card, avatar_bytes, text, priority=PRIORITY_CARDS)
+        return discord.File(io.BytesIO(image), welcome_image_filename("output"))
 
     @commands.Cog.listener()
     async def on_member_join(self, member):
@@ -119,6 +90,13 @@ class Events(commands.Cog):
             print(f"{Fore.YELLOW}{member} joined, but no System Message Channel available.")
             return
 
+        if self.join_bursts.record(guild.id):
+            self.pending_joins.setdefault(guild.id, []).append(member)
+            if guild.id not in self.batch_tasks:
+                print(f"{Fore.YELLOW}[EVENTS] Join raid in {guild.name}, batching welcome messages.")
+                self.batch_tasks[guild.id] = asyncio.create_task(self.send_join_batches(guild))
+            return
+
         text = f"{member.display_name} joined the {guild.name}!"
         try:
             file = await self.create_image(member, text)
@@ -127,6 +105,50 @@ class Events(commands.Cog):
             print(Fore.RED + f"[EVENTS] Error creating image: {e}")
             await channel.send(f"{member} joined.")
 
+    async def send_join_batches(self, guild):
+        try:
+            while True:
+                await asyncio.sleep(WELCOME_BATCH_INTERVAL)
+                members = self.pending_joins.pop(guild.id, [])
+                if members:
+                    await self.send_join_batch(guild, members)
+                # Back to one card per member once joins slow down
+                if not self.join_bursts.settle(guild.id) and guild.id not in self.pending_joins:
+                    print(f"{Fore.GREEN}[EVENTS] Joins in {guild.name} slowed down, sending welcome cards again.")
+                    break
+        finally:
+            self.batch_tasks.pop(guild.id, None)
+
+    async def send_join_batch(self, guild, members):
+        channel = guild.system_channel
+        if not channel:
+            return
+
+        names = ", ".join(member.display_name for member in members[:WELCOME_COLLAGE_MAX])
+        if len(members) > WELCOME_COLLAGE_MAX:
+            names += f" and {len(members) - WELCOME_COLLAGE_MAX} more"
+        summary = f"Welcome to the {guild.name}, {names}!"[:2000]
+        no_mentions = discord.AllowedMentions.none()
+
+        if WELCOME_BATCH_MODE == "collage":
+            try:
+                avatars = await asyncio.gather(*(
+                    self.web.fetch_avatar(member.display_avatar, size=128, format="png")
+                    for member in members[:WELCOME_COLLAGE_MAX]
+                ), return_exceptions=True)
+                avatars = [None if isinstance(avatar, Exception) else avatar for avatar in avatars]
+                text = f"{len(members)} members joined the {guild.name}!"
+                image = await self.renderer.render(render_join_collage, avatars, text, priority=PRIORITY_CARDS)
+                await channel.send(summary, file=discord.File(io.BytesIO(image), welcome_image_filename("joined")), allowed_mentions=no_mentions)
+                return
+            except Exception as e:
+                print(Fore.RED + f"[EVENTS] Error creating join collage: {e}")
+
+        try:
+            await channel.send(summary, allowed_mentions=no_mentions)
+        except discord.HTTPException as e:
+            print(Fore.RED + f"[EVENTS] Error sending batched welcome: {e}")
+
     @commands.Cog.listener()
     async def on_member_remove(self, member):
         guild = member.guild
@@ -144,6 +166,20 @@ class Events(commands.Cog):
             print(Fore.RED + f"[EVENTS] Error creating image: {e}")
             await channel.send(f"{member} left.")
 
+    @commands.command(name="renderstats")
+    @commands.is_owner()
+    async def render_stats(self, ctx):
+        stats = self.renderer.stats()
+        embed = discord.Embed(title="Image Renderer", color=EMBED_COLOR)
+        embed.add_field(name="Queue", value=f"{stats['queued']} waiting | {stats['running']}/{stats['workers']} running", inline=False)
+        embed.add_field(name="Jobs", value=f"{stats['completed']} done | {stats['failed']} failed | {stats['rejected']} rejected", inline=False)
+        embed.add_field(
+            name="Latency",
+            value=f"render p50 {stats['render_p50'] * 1000:.0f} ms | p95 {stats['render_p95'] * 1000:.0f} ms | wait p95 {stats['wait_p95'] * 1000:.0f} ms",
+            inline=False
+        )
+        await ctx.send(embed=embed)
+
     @commands.command(name="forceimage")
     async def force_image(self, ctx, member: discord.Member = None):
         if not DEBUG_MODE:
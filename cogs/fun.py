@@ -4,14 +4,25 @@ from discord import app_commands
 from typing import Optional
 import random
 import os
-from PIL import Image, ImageOps
-import requests
 from io import BytesIO
-from config import TAILS_IMAGE, HEADS_IMAGE, EMBED_COLOR, FILTERS_FOLDER
+from config import TAILS_IMAGE, HEADS_IMAGE, EMBED_COLOR, FILTER_CACHE_BYTES, FILTER_ANIMATED_SIZE
+from utils.web import get_web_client
+from utils.render import get_render_service
+from utils.filters import apply_filters, parse_filter_chain, filter_names, chain_version
+from utils.bytecache import ByteLRU
+from utils.animation import filter_animation, animated_extension
+
+FILTER_AVATAR_SIZE = 1024
+# Discord only serves power of two sizes, take the smallest one that covers FILTER_ANIMATED_SIZE
+ANIMATED_FETCH_SIZE = min(4096, max(16, 1 << (FILTER_ANIMATED_SIZE - 1).bit_length()))
 
 class Fun(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.web = get_web_client(bot)
+        self.renderer = get_render_service(bot)
+        # (avatar hash, size, filter chain, overlay versions) -> encoded result
+        self.filter_cache = ByteLRU(FILTER_CACHE_BYTES)
 
     @app_commands.command(name="roll", description="Roll a six-sided die.")
     async def roll(self, interaction: discord.Interaction):
@@ -51,79 +62,73 @@ class Fun(commands.Cog):
 
     @app_commands.command(name="filter", description="Apply a filter to an avatar.")
     @app_commands.describe(
-        filter="The filter to apply.",
+        filter="The filter to apply, chain filters with + (e.g. sepia+portuguese).",
         user="Optional user to apply the filter to (defaults to you)."
     )
-    @app_commands.choices(filter=[
-        app_commands.Choice(name="Grayscale", value="grayscale"),
-        app_commands.Choice(name="Invert", value="invert"),
-        app_commands.Choice(name="Sepia", value="sepia"),
-        app_commands.Choice(name="Portuguese", value="portuguese")
-    ])
-    async def filter(self, interaction: discord.Interaction, filter: app_commands.Choice[str], user: Optional[discord.User] = None):
+    async def filter(self, interaction: discord.Interaction, filter: str, user: Optional[discord.User] = None):
         target_user = user or interaction.user
-        avatar_url = target_user.display_avatar.url
+
+        try:
+            names = parse_filter_chain(filter)
+        except ValueError as e:
+            await interaction.response.send_message(f"Error: {e}", ephemeral=True)
+            return
 
         await interaction.response.defer()
 
         try:
-            response = requests.get(avatar_url)
-            avatar_image = Image.open(BytesIO(response.content)).convert("RGBA")
-
-            if filter.value == 'grayscale':
-                filtered_image = ImageOps.grayscale(avatar_image).convert("RGBA")
-
-            elif filter.value == 'invert':
-                r, g, b, a = avatar_image.split()
-                rgb_image = Image.merge("RGB", (r, g, b))
-                inverted_image = ImageOps.invert(rgb_image)
-                r2, g2, b2 = inverted_image.split()
-                filtered_image = Image.merge("RGBA", (r2, g2, b2, a))
-
-            elif filter.value == 'sepia':
-                img = avatar_image.convert("RGB")
-                pixels = img.load()
-                for y in range(img.height):
-                    for x in range(img.width):
-                        r, g, b = img.getpixel((x, y))
-                        tr = int(0.393 * r + 0.769 * g + 0.189 * b)
-                        tg = int(0.349 * r + 0.686 * g + 0.168 * b)
-                        tb = int(0.272 * r + 0.534 * g + 0.131 * b)
-                        tr, tg, tb = min(255, tr), min(255, tg), min(255, tb)
-                        pixels[x, y] = (tr, tg, tb)
-                filtered_image = img.convert("RGBA")
-
-            elif filter.value == 'portuguese':
-                filter_path = os.path.join(FILTERS_FOLDER, "portuguese.png")
-                if not os.path.exists(filter_path):
-                    await interaction.followup.send("Error: Portuguese filter image not found.", ephemeral=True)
-                    return
-
-                filter_image = Image.open(filter_path).convert("RGBA")
-                filter_image = filter_image.resize(avatar_image.size)
-
-                opacity = 0.2
-                alpha = filter_image.split()[3]
-                alpha = alpha.point(lambda p: int(p * opacity))
-                filter_image.putalpha(alpha)
-
-                filtered_image = Image.alpha_composite(avatar_image, filter_image)
-
-            output_buffer = BytesIO()
-            filtered_image.save(output_buffer, format='PNG')
-            output_buffer.seek(0)
-
-            file = discord.File(fp=output_buffer, filename="filtered_avatar.png")
+            avatar = target_user.display_avatar
+            animated = avatar.is_animated()
+            size = ANIMATED_FETCH_SIZE if animated else FILTER_AVATAR_SIZE
+            cache_key = (avatar.key, size, tuple(names), chain_version(names))
+            image = self.filter_cache.get(cache_key)
+            if image is None:
+                avatar_bytes = await self.web.fetch_avatar(avatar, size=size)
+                if animated:
+                    image = await self.renderer.render(filter_animation, avatar_bytes, names)
+                else:
+                    image = await self.renderer.render(apply_filters, avatar_bytes, names)
+                self.filter_cache.put(cache_key, image)
+            output_buffer = BytesIO(image)
+
+            filename = f"filtered_avatar.{animated_extension() if animated else 'png'}"
+            file = discord.File(fp=output_buffer, filename=filename)
             embed = discord.Embed(
-                title=f"{target_user.name}'s Avatar with {filter.name} Filter",
+                title=f"{target_user.name}'s Avatar with {' + '.join(name.title() for name in names)} Filter",
                 color=EMBED_COLOR
             )
-            embed.set_image(url="attachment://filtered_avatar.png")
+            embed.set_image(url=f"attachment://{filename}")
             await interaction.followup.send(embed=embed, file=file)
 
+        except (ValueError, FileNotFoundError) as e:
+            await interaction.followup.send(f"Error: {e}", ephemeral=True)
         except Exception as e:
             await interaction.followup.send(f"[FUN] An error occurred while applying the filter: {e}", ephemeral=True)
 
+    @commands.command(name="filtercache")
+    @commands.is_owner()
+    async def filter_cache_stats(self, ctx):
+        stats = self.filter_cache.stats()
+        embed = discord.Embed(title="Filter Cache", color=EMBED_COLOR)
+        embed.add_field(name="Hit ratio", value=f"{stats['hit_ratio']:.1%} ({stats['hits']} hits, {stats['misses']} misses)", inline=False)
+        embed.add_field(
+            name="Memory",
+            value=f"{stats['bytes'] / 1024 / 1024:.1f} / {stats['max_bytes'] / 1024 / 1024:.0f} MiB in {stats['entries']} results, {stats['evictions']} evicted",
+            inline=False
+        )
+        await ctx.send(embed=embed)
+
+    @filter.autocomplete("filter")
+    async def filter_autocomplete(self, interaction: discord.Interaction, current: str):
+        # Completes the last filter of a chain, keeping the ones already typed
+        chained, _, last = current.rpartition("+")
+        prefix = f"{chained}+" if chained else ""
+        last = last.strip().lower()
+        return [
+            app_commands.Choice(name=f"{prefix}{name}", value=f"{prefix}{name}")
+            for name in filter_names() if name.startswith(last)
+        ][:25]
+
 
 async def setup(bot):
     await bot.add_cog(Fun(bot))
@@ -1,44 +1,349 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
-import json
-import os
 import random
 import asyncio
-from config import EMBED_COLOR, LEVELS_FILE
+import time
+import csv
+import io
+import json
+import os
+from config import EMBED_COLOR, NEXT_COLOR, BACK_COLOR, LEVELS_SAVE_INTERVAL, LEVELS_MAX_DIRTY, LEADERBOARD_PAGE_TTL
+from config import LEVELS_COOLDOWN, LEVELS_GUILD_COOLDOWNS, LEVELS_MAX_COOLDOWNS
+from config import VOICE_XP_PER_MINUTE, VOICE_SETTLE_INTERVAL, LEVEL_ROLE_SYNC_DELAY
+from colorama import Fore, Style
+from typing import Optional
+from utils.levelstore import create_level_store
+from utils.usercache import get_user_cache
+from utils.cooldowns import CooldownTracker
+from utils.levelmath import required_xp, total_xp, level_from_total_xp
+from utils.guildconfig import get_guild_config_store
+from utils.levelsio import export_ndjson_file, import_ndjson
+from utils.cards import render_rank_card
+from utils.web import get_web_client
+from utils.render import get_render_service
+
+LEADERBOARD_PAGE_SIZE = 10
+
+class LeaderboardView(discord.ui.View):
+    def __init__(self, cog, total, page=0):
+        super().__init__(timeout=60)
+        self.cog = cog
+        self.page = page
+        self.max_pages = max(1, (total - 1) // LEADERBOARD_PAGE_SIZE + 1)
+        self.update_buttons()
+
+    def update_buttons(self):
+        self.back.disabled = self.page == 0
+        self.next.disabled = self.page >= self.max_pages - 1
+
+    async def show_page(self, interaction):
+        self.update_buttons()
+        embed = await self.cog.leaderboard_page(interaction, self.page)
+        if interaction.response.is_done():
+            await interaction.edit_original_response(embed=embed, view=self)
+        else:
+            await interaction.response.edit_message(embed=embed, view=self)
+
+    @discord.ui.button(label="Back", style=BACK_COLOR)
+    async def back(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = max(0, self.page - 1)
+        await self.show_page(interaction)
+
+    @discord.ui.button(label="Next", style=NEXT_COLOR)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = min(self.max_pages - 1, self.page + 1)
+        await self.show_page(interaction)
 
 class Leveling(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.levels = self.load_levels()
-        self.cooldowns = {}
+        self.store = create_level_store()
+        self.users = get_user_cache(bot)
+        self.web = get_web_client(bot)
+        self.renderer = get_render_service(bot)
+        self.leaderboard_pages = {}
+        self.cooldowns = CooldownTracker(LEVELS_COOLDOWN, LEVELS_GUILD_COOLDOWNS, LEVELS_MAX_COOLDOWNS)
+        # (guild_id, member_id) -> monotonic time the member's voice XP was last credited
+        self.voice_sessions = {}
+        self.config = get_guild_config_store(bot)
+        # guild_id -> member ids waiting for a level role sync, None means every ranked member
+        self.role_sync_pending = {}
+        # guild_id -> role ids that stopped being rewards and must be taken from members
+        self.role_sync_removed = {}
+        self.role_sync_queue = asyncio.Queue()
+        self.role_sync_task = None
+        self.flush_levels.start()
+        if VOICE_XP_PER_MINUTE > 0:
+            self.settle_voice.start()
+
+    async def cog_load(self):
+        self.role_sync_task = asyncio.create_task(self.role_sync_worker())
+
+    async def cog_unload(self):
+        if self.role_sync_task:
+            self.role_sync_task.cancel()
+        # stop() lets a save that is already writing finish, the save below then waits for it
+        self.flush_levels.stop()
+        self.settle_voice.cancel()
+        self.settle_voice_sessions(list(self.voice_sessions), close=True)
+        await self.store.save()
+        self.store.close()
+
+    def mark_dirty(self):
+        if self.store.dirty_changes >= LEVELS_MAX_DIRTY and not self.store.save_lock.locked():
+            asyncio.create_task(self.store.save())
+
+    @tasks.loop(seconds=LEVELS_SAVE_INTERVAL)
+    async def flush_levels(self):
+        await self.store.save()
+
+    @tasks.loop(seconds=VOICE_SETTLE_INTERVAL)
+    async def settle_voice(self):
+        # Long sessions are credited in batches so XP shows up before the member leaves
+        self.settle_voice_sessions(list(self.voice_sessions))
+        self.mark_dirty()
+
+    @settle_voice.before_loop
+    async def before_settle_voice(self):
+        # Pick up members that were already in voice when the cog loaded
+        await self.bot.wait_until_ready()
+        for guild in self.bot.guilds:
+            for channel in guild.voice_channels:
+                for member in channel.members:
+                    if not member.bot:
+                        self.refresh_voice_session(member, member.voice)
+
+    def settle_voice_sessions(self, keys, close=False):
+        now = time.monotonic()
+        by_guild = {}
+        for key in keys:
+            started = self.voice_sessions.pop(key, None) if close else self.voice_sessions.get(key)
+            if started is None:
+                continue
+            xp_gain = int((now - started) / 60 * VOICE_XP_PER_MINUTE)
+            if not close and xp_gain:
+                # Keep the unpaid part of the minute for the next settle
+                self.voice_sessions[key] = started + xp_gain * 60 / VOICE_XP_PER_MINUTE
+            if xp_gain:
+                by_guild.setdefault(key[0], []).append((key[1], xp_gain))
+
+        for guild_id, gains in by_guild.items():
+            guild = self.bot.get_guild(guild_id)
+            records = []
+            leveled_up = []
+            for member_id, xp_gain in gains:
+                data = self.store.get_member(guild_id, member_id) or {"xp": 0, "level": 1}
+                level, xp = level_from_total_xp(total_xp(data["level"], data["xp"]) + xp_gain)
+                records.append((str(member_id), xp, level))
+                if level > data["level"]:
+                    leveled_up.append(member_id)
+            self.store.update_members(guild_id, guild.name if guild else "Unknown", records)
+            if leveled_up:
+                self.queue_role_sync(guild_id, leveled_up)
+
+    def count_listeners(self, channel, limit=3):
+        count = 0
+        for member in channel.members:
+            if not member.bot:
+                count += 1
+                if count >= limit:
+                    break
+        return count
+
+    def earns_voice_xp(self, member, state):
+        channel = state.channel if state else None
+        if channel is None or member.bot or state.afk or state.self_deaf or state.deaf:
+            return False
+        if channel == member.guild.afk_channel:
+            return False
+        return self.count_listeners(channel) >= 2
+
+    def refresh_voice_session(self, member, state):
+        key = (member.guild.id, member.id)
+        if self.earns_voice_xp(member, state):
+            self.voice_sessions.setdefault(key, time.monotonic())
+        elif key in self.voice_sessions:
+            self.settle_voice_sessions([key], close=True)
+            self.mark_dirty()
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member, before, after):
+        if VOICE_XP_PER_MINUTE <= 0 or member.bot:
+            return
 
-    def load_levels(self):
-        if os.path.exists(LEVELS_FILE):
+        self.refresh_voice_session(member, after)
+
+        # Someone joining or leaving only changes the "solo" status of others
+        # when the channel goes between one and two people, then there is one other member to check
+        if before.channel is not None and before.channel != after.channel:
+            if self.count_listeners(before.channel) == 1:
+                for other in before.channel.members:
+                    if not other.bot:
+                        self.refresh_voice_session(other, other.voice)
+        if after.channel is not None and after.channel != before.channel:
+            if self.count_listeners(after.channel) == 2:
+                for other in after.channel.members:
+                    if not other.bot and other.id != member.id:
+                        self.refresh_voice_session(other, other.voice)
+
+    def get_level_roles(self, guild_id):
+        level_roles = self.config.get_guild_config(guild_id).get("level_roles", {})
+        return {int(level): role_id for level, role_id in level_roles.items()}
+
+    def diff_level_roles(self, member, level, level_roles, removed_role_ids=()):
+        # Members keep every reward up to their level and lose rewards above it,
+        # plus rewards that were just removed from the configuration
+        reward_ids = set(level_roles.values()) | set(removed_role_ids)
+        wanted_ids = {role_id for reward_level, role_id in level_roles.items() if reward_level <= level}
+        current_ids = {role.id for role in member.roles}
+        to_add = [member.guild.get_role(role_id) for role_id in wanted_ids - current_ids]
+        to_remove = [role for role in member.roles if role.id in reward_ids - wanted_ids]
+        return [role for role in to_add if role is not None], to_remove
+
+    async def apply_level_roles(self, member, level, level_roles=None, removed_role_ids=()):
+        if level_roles is None:
+            level_roles = self.get_level_roles(member.guild.id)
+        if not level_roles and not removed_role_ids:
+            return False
+
+        to_add, to_remove = self.diff_level_roles(member, level, level_roles, removed_role_ids)
+        try:
+            if to_add:
+                await member.add_roles(*to_add, reason=f"Level {level} reward")
+            if to_remove:
+                await member.remove_roles(*to_remove, reason=f"Level {level} reward")
+        except discord.Forbidden:
+            print(
+                f"[LEVELING][ERROR] Insufficient permissions to update level roles "
+                f"in server {Fore.MAGENTA}{member.guild.name}{Style.RESET_ALL} "
+                f"(ID: {Fore.YELLOW}{member.guild.id}{Style.RESET_ALL})"
+            )
+        except discord.HTTPException as e:
+            print(f"[LEVELING][ERROR] Error updating level roles for {member}: {Fore.RED}{e}{Style.RESET_ALL}")
+        return bool(to_add or to_remove)
+
+    def queue_role_sync(self, guild_id, member_ids=None, removed_role_ids=()):
+        if removed_role_ids:
+            self.role_sync_removed.setdefault(guild_id, set()).update(removed_role_ids)
+        if guild_id in self.role_sync_pending:
+            pending = self.role_sync_pending[guild_id]
+            if pending is not None:
+                self.role_sync_pending[guild_id] = None if member_ids is None else pending | set(member_ids)
+            return
+        self.role_sync_pending[guild_id] = None if member_ids is None else set(member_ids)
+        self.role_sync_queue.put_nowait(guild_id)
+
+    async def role_sync_worker(self):
+        # Syncs run one guild at a time and pause between REST calls,
+        # so a reward change for a big server never bursts the API
+        await self.bot.wait_until_ready()
+        while True:
+            guild_id = await self.role_sync_queue.get()
+            member_ids = self.role_sync_pending.pop(guild_id, None)
+            removed_role_ids = self.role_sync_removed.pop(guild_id, set())
             try:
-                with open(LEVELS_FILE, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                print("[LEVELING] The JSON file is corrupted. Creating a new one...")
-                return {}
-        return {}
+                await self.sync_level_roles(guild_id, member_ids, removed_role_ids)
+            except Exception as e:
+                print(f"[LEVELING][ERROR] Error syncing level roles for server {guild_id}: {Fore.RED}{e}{Style.RESET_ALL}")
+
+    async def sync_level_roles(self, guild_id, member_ids, removed_role_ids):
+        guild = self.bot.get_guild(guild_id)
+        level_roles = self.get_level_roles(guild_id)
+        if guild is None or not (level_roles or removed_role_ids):
+            return
+
+        if member_ids is None:
+            # Every stored member, buffered XP included
+            await self.store.save()
+            entries = list(self.store.iter_members(guild_id))
+        else:
+            entries = []
+            for member_id in member_ids:
+                data = self.store.get_member(guild_id, member_id)
+                if data:
+                    entries.append((str(member_id), data["xp"], data["level"]))
+
+        updated = 0
+        for member_id, _, level in entries:
+            member = guild.get_member(int(member_id))
+            if member is None:
+                continue
+            if await self.apply_level_roles(member, level, level_roles, removed_role_ids):
+                updated += 1
+                await asyncio.sleep(LEVEL_ROLE_SYNC_DELAY)
+
+        if updated:
+            print(
+                f"[LEVELING]: Synced level roles for {Fore.GREEN}{updated}{Style.RESET_ALL} members "
+                f"in server {Fore.MAGENTA}{guild.name}{Style.RESET_ALL} (ID: {Fore.YELLOW}{guild.id}{Style.RESET_ALL})"
+            )
+
+    @commands.command(name="levelrole")
+    @commands.has_permissions(administrator=True)
+    @commands.guild_only()
+    async def levelrole(self, ctx: commands.Context, level: int, role: Optional[discord.Role] = None):
+        level_roles = dict(self.config.get_guild_config(ctx.guild.id).get("level_roles", {}))
+        # The role this level gave until now, stripped from members if it stops being a reward
+        previous_role_id = level_roles.get(str(level))
+
+        if role is None:
+            if str(level) not in level_roles:
+                await ctx.send(f"No role reward is configured for level {level}.", delete_after=5)
+                return
+            del level_roles[str(level)]
+            await ctx.send(f"The role reward for level {level} has been removed.", delete_after=5)
+        else:
+            if role.is_default() or role.managed:
+                await ctx.send("That role cannot be given as a reward.", delete_after=5)
+                return
+            level_roles[str(level)] = role.id
+            await ctx.send(f"Members reaching level {level} will get {role.mention}.", delete_after=5)
 
-    def save_levels(self):
-        with open(LEVELS_FILE, 'w') as f:
-            json.dump(self.levels, f, indent=4)
+        self.config.update_guild_config(ctx.guild.id, "level_roles", level_roles)
+        self.config.update_guild_config(ctx.guild.id, "server_name", ctx.guild.name)
+        removed_role_ids = set()
+        if previous_role_id is not None and previous_role_id not in level_roles.values():
+            removed_role_ids.add(previous_role_id)
+        self.queue_role_sync(ctx.guild.id, removed_role_ids=removed_role_ids)
+        print(
+            f"[LEVELING]: Level {level} reward set to {Fore.CYAN}{role.name if role else 'None'}{Style.RESET_ALL} "
+            f"in server {Fore.MAGENTA}{ctx.guild.name}{Style.RESET_ALL} (ID: {Fore.YELLOW}{ctx.guild.id}{Style.RESET_ALL})"
+        )
 
     def get_required_xp(self, level):
-        return 100 + (level - 1) * 50
+        return required_xp(level)
+
+    def parse_xp_file(self, filename, content):
+        text = content.decode("utf-8-sig")
+        if filename.lower().endswith(".json"):
+            data = json.loads(text)
+            if isinstance(data, dict):
+                rows = list(data.items())
+            else:
+                rows = [(row.get("member", row.get("member_id")), row.get("xp")) for row in data]
+        else:
+            rows = [row for row in csv.reader(io.StringIO(text)) if row]
+            if rows and not rows[0][-1].strip().lstrip("-").isdigit():
+                rows = rows[1:]
+
+        records = {}
+        for line, row in enumerate(rows, start=1):
+            if len(row) < 2:
+                raise ValueError(f"Row {line} needs a member and an XP value.")
+            member, xp = row[0], row[1]
+            try:
+                member_id = int(str(member).strip().strip("<@!>"))
+                xp = int(str(xp).strip())
+            except ValueError:
+                raise ValueError(f"Row {line} has an invalid member or XP value: `{member}`, `{xp}`")
+            records[member_id] = records.get(member_id, 0) + xp
+        return records
     
     @commands.Cog.listener()
     async def on_guild_update(self, before: discord.Guild, after: discord.Guild):
-        guild_id = str(after.id)
-        guild_name = after.name
-
-        if guild_id in self.levels:
-            if self.levels[guild_id]["server_name"] != guild_name:
-                self.levels[guild_id]["server_name"] = guild_name
-                self.save_levels()
+        if self.store.update_server_name(after.id, after.name):
+            self.mark_dirty()
 
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -49,34 +354,26 @@ class Leveling(commands.Cog):
         member_id = str(message.author.id)
         guild_name = message.guild.name
 
-        if guild_id not in self.levels:
-            self.levels[guild_id] = {"server_name": guild_name, "members": {}}
-        else:
-            self.levels[guild_id]["server_name"] = guild_name
-
-        if member_id not in self.levels[guild_id]["members"]:
-            self.levels[guild_id]["members"][member_id] = {"xp": 0, "level": 1}
-
-        if member_id in self.cooldowns:
-            if self.cooldowns[member_id] > asyncio.get_event_loop().time():
-                return
-        self.cooldowns[member_id] = asyncio.get_event_loop().time() + 5
+        if not self.cooldowns.hit(message.guild.id, message.author.id):
+            return
 
+        data = self.store.get_member(guild_id, member_id) or {"xp": 0, "level": 1}
         xp_gain = random.randint(5, 15)
-        self.levels[guild_id]["members"][member_id]["xp"] += xp_gain
-        xp = self.levels[guild_id]["members"][member_id]["xp"]
-        level = self.levels[guild_id]["members"][member_id]["level"]
+        xp = data["xp"] + xp_gain
+        level = data["level"]
 
         required_xp = self.get_required_xp(level)
-        if xp >= required_xp:
-            excess_xp = xp - required_xp
-            self.levels[guild_id]["members"][member_id]["level"] += 1
-            self.levels[guild_id]["members"][member_id]["xp"] = excess_xp
+        leveled_up = xp >= required_xp
+        if leveled_up:
+            xp -= required_xp
+            level += 1
 
-            new_level = self.levels[guild_id]["members"][member_id]["level"]
-            await message.channel.send(f"{message.author.mention}, you leveled up to **{new_level}**!")
+        self.store.update_member(guild_id, guild_name, member_id, xp, level)
+        self.mark_dirty()
 
-        self.save_levels()
+        if leveled_up:
+            await message.channel.send(f"{message.author.mention}, you leveled up to **{level}**!")
+            await self.apply_level_roles(message.author, level)
 
     @app_commands.command(name="level", description="Shows the level and XP of a user.")
     @app_commands.describe(member="The user whose level you want to see.")
@@ -85,62 +382,203 @@ class Leveling(commands.Cog):
         if member is None:
             member = interaction.user
 
-        guild_id = str(interaction.guild.id)
-        member_id = str(member.id)
+        data = self.store.get_member(interaction.guild.id, member.id)
 
-        if guild_id in self.levels and member_id in self.levels[guild_id]["members"]:
-            level = self.levels[guild_id]["members"][member_id]["level"]
-            xp = self.levels[guild_id]["members"][member_id]["xp"]
+        if data:
+            level = data["level"]
+            xp = data["xp"]
             required_xp = self.get_required_xp(level)
             remaining_xp = required_xp - xp
+            rank, total = await self.store.rank_member(interaction.guild.id, member.id)
             await interaction.response.send_message(
-                f"{member.mention} is at level **{level}** with **{xp}** XP.\nNeeds **{remaining_xp} XP** more to level up!"
+                f"{member.mention} is at level **{level}** with **{xp}** XP, ranked **#{rank}** of {total}.\n"
+                f"Needs **{remaining_xp} XP** more to level up!"
             )
         else:
             await interaction.response.send_message(f"{member.mention} has no levels recorded yet.")
 
-    @app_commands.command(name="leaderboard", description="Shows the ranking of users with the most levels.")
+    @app_commands.command(name="grantxp", description="Grant or set XP for many members from a CSV or JSON file. (Admins only)")
+    @app_commands.describe(
+        file="CSV with member,xp rows or JSON like {\"member_id\": xp}.",
+        mode="Add the XP to what members have, or replace their total XP."
+    )
+    @app_commands.choices(mode=[
+        app_commands.Choice(name="Grant", value="grant"),
+        app_commands.Choice(name="Set", value="set")
+    ])
+    @app_commands.checks.has_permissions(administrator=True)
     @app_commands.guild_only()
-    async def leaderboard(self, interaction: discord.Interaction):
-        guild_id = str(interaction.guild.id)
+    async def grantxp(self, interaction: discord.Interaction, file: discord.Attachment, mode: app_commands.Choice[str]):
+        await interaction.response.defer(ephemeral=True)
 
-        if guild_id not in self.levels or "members" not in self.levels[guild_id]:
-            await interaction.response.send_message("There is no level data for this server yet.")
+        try:
+            grants = self.parse_xp_file(file.filename, await file.read())
+        except (ValueError, TypeError, AttributeError) as e:
+            await interaction.followup.send(f"Could not read `{file.filename}`: {e}", ephemeral=True)
             return
 
-        sorted_levels = sorted(
-            self.levels[guild_id]["members"].items(),
-            key=lambda x: (x[1]['level'], x[1]['xp']),
-            reverse=True
+        guild = interaction.guild
+        records = []
+        level_ups = 0
+        for member_id, xp in grants.items():
+            data = self.store.get_member(guild.id, member_id) or {"xp": 0, "level": 1}
+            if mode.value == "grant":
+                total = total_xp(data["level"], data["xp"]) + xp
+            else:
+                total = xp
+            level, remaining_xp = level_from_total_xp(total)
+            if level > data["level"]:
+                level_ups += 1
+            records.append((str(member_id), remaining_xp, level))
+
+        self.store.update_members(guild.id, guild.name, records)
+        await self.store.save()
+        self.leaderboard_pages.clear()
+        self.queue_role_sync(guild.id, grants.keys())
+
+        await interaction.followup.send(
+            f"Updated XP for **{len(records)}** members ({level_ups} leveled up).",
+            ephemeral=True
         )
+        print(
+            f"[LEVELING]: {interaction.user} applied {mode.value} XP for {len(records)} members "
+            f"in server {guild.name} (ID: {guild.id})"
+        )
+
+    @app_commands.command(name="exportlevels", description="Export this server's level data as NDJSON. (Admins only)")
+    @app_commands.checks.has_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def exportlevels(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
+        await self.store.save()
+
+        guild = interaction.guild
+        # Streamed to a temporary file so memory stays flat however big the server is
+        path, (_, members) = await asyncio.to_thread(export_ndjson_file, self.store, {str(guild.id)})
+        try:
+            with open(path, "rb") as export:
+                file = discord.File(export, filename=f"levels-{guild.id}.ndjson")
+                await interaction.followup.send(f"Exported **{members}** members.", file=file, ephemeral=True)
+        finally:
+            os.remove(path)
+
+    @app_commands.command(name="importlevels", description="Restore this server's level data from an NDJSON export. (Admins only)")
+    @app_commands.describe(file="An NDJSON file created by /exportlevels.")
+    @app_commands.checks.has_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def importlevels(self, interaction: discord.Interaction, file: discord.Attachment):
+        await interaction.response.defer(ephemeral=True)
+
+        guild = interaction.guild
+        try:
+            _, members = await import_ndjson(self.store, io.BytesIO(await file.read()), guild.id)
+        except (ValueError, UnicodeDecodeError) as e:
+            await interaction.followup.send(f"Could not import `{file.filename}`: {e}", ephemeral=True)
+            return
+
+        self.store.update_server_name(guild.id, guild.name)
+        self.leaderboard_pages.clear()
+        self.queue_role_sync(guild.id)
+        await interaction.followup.send(f"Imported **{members}** members.", ephemeral=True)
+        print(
+            f"[LEVELING]: {interaction.user} imported {members} members "
+            f"in server {Fore.MAGENTA}{guild.name}{Style.RESET_ALL} (ID: {Fore.YELLOW}{guild.id}{Style.RESET_ALL})"
+        )
+
+    async def leaderboard_page(self, interaction, page):
+        guild = interaction.guild
+        key = (guild.id, page)
+        cached = self.leaderboard_pages.get(key)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
+        offset = page * LEADERBOARD_PAGE_SIZE
+        entries = await self.store.top_members(guild.id, LEADERBOARD_PAGE_SIZE, offset)
+
+        names = {}
+        missing = []
+        for member_id, _, _ in entries:
+            member = guild.get_member(int(member_id)) or self.users.get(int(member_id))
+            if member:
+                names[member_id] = member.name
+            else:
+                missing.append(int(member_id))
+
+        if missing:
+            # REST lookups can take longer than the interaction deadline
+            if not interaction.response.is_done():
+                await interaction.response.defer()
+            fetched = await self.users.fetch_many(missing)
+            for user_id, user in fetched.items():
+                if user:
+                    names[str(user_id)] = user.name
 
         leaderboard = []
-        for i, (member_id, data) in enumerate(sorted_levels[:10], start=1):
-            user = await self.bot.fetch_user(int(member_id))
-            if user:
-                if i == 1:
-                    emoji = "🥇"
-                    leaderboard.append(f"{emoji} **{user.name}** - Level: {data['level']} | XP: {data['xp']}")
-                elif i == 2:
-                    emoji = "🥈"
-                    leaderboard.append(f"{emoji} **{user.name}** - Level: {data['level']} | XP: {data['xp']}")
-                elif i == 3:
-                    emoji = "🥉"
-                    leaderboard.append(f"{emoji} **{user.name}** - Level: {data['level']} | XP: {data['xp']}")
-                else:
-                    leaderboard.append(f"▫️ **{i}. {user.name}** - Level: {data['level']} | XP: {data['xp']}")
-
-        if leaderboard:
-            embed = discord.Embed(
-                title="Level Leaderboard",
-                description="\n".join(leaderboard),
-                color=EMBED_COLOR
-            )
-            embed.set_footer(text="Keep chatting to level up!")
-            await interaction.response.send_message(embed=embed)
-        else:
-            await interaction.response.send_message("No one is on the leaderboard yet.")
+        for i, (member_id, xp, level) in enumerate(entries, start=offset + 1):
+            name = names.get(member_id, "Unknown User")
+            if i == 1:
+                emoji = "🥇"
+                leaderboard.append(f"{emoji} **{name}** - Level: {level} | XP: {xp}")
+            elif i == 2:
+                emoji = "🥈"
+                leaderboard.append(f"{emoji} **{name}** - Level: {level} | XP: {xp}")
+            elif i == 3:
+                emoji = "🥉"
+                leaderboard.append(f"{emoji} **{name}** - Level: {level} | XP: {xp}")
+            else:
+                leaderboard.append(f"▫️ **{i}. {name}** - Level: {level} | XP: {xp}")
+
+        total = self.store.member_count(guild.id)
+        max_pages = max(1, (total - 1) // LEADERBOARD_PAGE_SIZE + 1)
+        embed = discord.Embed(
+            title="Level Leaderboard",
+            description="\n".join(leaderboard) or "No one is on this page.",
+            color=EMBED_COLOR
+        )
+        embed.set_footer(text=f"Page {page + 1}/{max_pages} | Keep chatting to level up!")
+
+        now = time.monotonic()
+        for stale_key in [k for k, (_, expires) in self.leaderboard_pages.items() if expires <= now]:
+            del self.leaderboard_pages[stale_key]
+        self.leaderboard_pages[key] = (embed, now + LEADERBOARD_PAGE_TTL)
+        return embed
+
+    @app_commands.command(name="rank", description="Shows a rank card with the level and XP of a user.")
+    @app_commands.describe(member="The user whose rank card you want to see.")
+    @app_commands.guild_only()
+    async def rank(self, interaction: discord.Interaction, member: discord.Member = None):
+        if member is None:
+            member = interaction.user
+
+        data = self.store.get_member(interaction.guild.id, member.id)
+        if not data:
+            await interaction.response.send_message(f"{member.mention} has no levels recorded yet.")
+            return
+
+        await interaction.response.defer()
+        rank, total = await self.store.rank_member(interaction.guild.id, member.id)
+        avatar_bytes = await self.web.fetch_avatar(member.display_avatar, size=256, format="png")
+        card = await self.renderer.render(
+            render_rank_card, avatar_bytes, member.display_name, rank, total,
+            data["level"], data["xp"], self.get_required_xp(data["level"])
+        )
+        await interaction.followup.send(file=discord.File(io.BytesIO(card), filename="rank.png"))
+
+    @app_commands.command(name="leaderboard", description="Shows the ranking of users with the most levels.")
+    @app_commands.guild_only()
+    async def leaderboard(self, interaction: discord.Interaction):
+        total = self.store.member_count(interaction.guild.id)
+
+        if not total:
+            await interaction.response.send_message("There is no level data for this server yet.")
+            return
 
+        view = LeaderboardView(self, total)
+        embed = await self.leaderboard_page(interaction, 0)
+        if interaction.response.is_done():
+            await interaction.followup.send(embed=embed, view=view)
+        else:
+            await interaction.response.send_message(embed=embed, view=view)
 
 async def setup(bot):
     await bot.add_cog(Leveling(bot))
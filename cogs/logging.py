@@ -1,8 +1,8 @@
 import discord
 from discord.ext import commands
-import json
 from colorama import Fore, Style, init
-from config import SERVER_OPTIONS, EMBED_COLOR
+from config import EMBED_COLOR
+from utils.guildconfig import get_guild_config_store
 from datetime import datetime, timezone
 from typing import Optional
 import asyncio
@@ -16,35 +16,13 @@ class ServerLogs(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.ignored_channels = set()
+        self.config = get_guild_config_store(bot)
     
-    def load_config(self):
-        try:
-            with open(SERVER_OPTIONS, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-
-    def save_config(self, data):
-        with open(SERVER_OPTIONS, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
-
-    def get_guild_config(self, guild_id):
-        data = self.load_config()
-        return data.get(str(guild_id), {})
-
-    def update_guild_config(self, guild_id, key, value):
-        data = self.load_config()
-        guild_id = str(guild_id)
-        if guild_id not in data:
-            data[guild_id] = {"server_name": "Unknown"}
-        data[guild_id][key] = value
-        self.save_config(data)
-
     async def send_embed(self, guild, embed):
         if guild.id in self.ignored_channels:
             return
             
-        guild_config = self.get_guild_config(guild.id)
+        guild_config = self.config.get_guild_config(guild.id)
         channel_id = guild_config.get("log_channel")
         if not channel_id:
             return
@@ -326,12 +304,7 @@ class ServerLogs(commands.Cog):
 
         if before.name != after.name:
             changes.append(f"**Name:** {before.name} → {after.name}")
-            data = self.load_config()
-            guild_id = str(after.id)
-            
-            if guild_id in data:
-                data[guild_id]["server_name"] = after.name
-                self.save_config(data)
+            self.config.update_server_name(after.id, after.name)
 
         if before.description != after.description:
             changes.append(f"**Description:** {before.description or 'None'} → {after.description or 'None'}")
@@ -660,12 +633,9 @@ class ServerLogs(commands.Cog):
     @commands.guild_only()
     async def logchannel(self, ctx: commands.Context, action: Optional[str] = None):
         guild_id = str(ctx.guild.id)
-        data = self.load_config()
 
         if action and action.lower() == "clear":
-            if guild_id in data and "log_channel" in data[guild_id]:
-                del data[guild_id]["log_channel"]
-                self.save_config(data)
+            if self.config.remove_guild_config(guild_id, "log_channel"):
                 await ctx.send("Log channel removed.", delete_after=5)
                 print(
                     f"[LOGCHANNEL]: Log channel removed for server {Fore.MAGENTA}{ctx.guild.name}{Style.RESET_ALL} "
@@ -679,8 +649,8 @@ class ServerLogs(commands.Cog):
                 )
         else:
             channel = ctx.channel
-            self.update_guild_config(guild_id, "log_channel", channel.id)
-            self.update_guild_config(guild_id, "server_name", ctx.guild.name)
+            self.config.update_guild_config(guild_id, "log_channel", channel.id)
+            self.config.update_guild_config(guild_id, "server_name", ctx.guild.name)
             await ctx.send(f"Log channel set to {channel.mention}.", delete_after=5)
             print(
                 f"[LOGCHANNEL]: Log channel set to {Fore.BLUE}{channel.name}{Style.RESET_ALL} "
@@ -4,8 +4,8 @@ from discord import app_commands
 from colorama import Fore, Style, init
 from datetime import datetime, timezone
 from typing import Optional
-import json
-from config import EMBED_COLOR, SERVER_OPTIONS
+from config import EMBED_COLOR
+from utils.guildconfig import get_guild_config_store
 init(autoreset=True)
 
 class ReportView(discord.ui.Modal, title="Report a User"):
@@ -159,39 +159,11 @@ class UnbanView(discord.ui.View):
 class Moderation(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        
-    def load_config(self):
-        try:
-            with open(SERVER_OPTIONS, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
-
-    def save_config(self, data):
-        with open(SERVER_OPTIONS, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
-
-    def get_guild_config(self, guild_id):
-        data = self.load_config()
-        return data.get(str(guild_id), {})
-
-    def update_guild_config(self, guild_id, key, value):
-        data = self.load_config()
-        guild_id = str(guild_id)
-        if guild_id not in data:
-            data[guild_id] = {"server_name": "Unknown"}
-        data[guild_id][key] = value
-        self.save_config(data)
+        self.config = get_guild_config_store(bot)
 
     @commands.Cog.listener()
     async def on_guild_update(self, before: discord.Guild, after: discord.Guild):
-        guild_id = str(after.id)
-        data = self.load_config()
-
-        if guild_id in data:
-            if data[guild_id].get("server_name") != after.name:
-                data[guild_id]["server_name"] = after.name
-                self.save_config(data)
+        self.config.update_server_name(after.id, after.name)
 
     @app_commands.command(name="ban", description="Ban a user from the server. (Mods only)")
     @app_commands.describe(member="The user to be banned.", reason="The reason for the ban.")
@@ -299,19 +271,16 @@ class Moderation(commands.Cog):
     @app_commands.command(name="report", description="Report a user to the moderators.")
     @app_commands.guild_only()
     async def report(self, interaction: discord.Interaction, user: discord.User):
-        await interaction.response.send_modal(ReportView(user, self.get_guild_config))
+        await interaction.response.send_modal(ReportView(user, self.config.get_guild_config))
 
     @commands.command(name="reportchannel")
     @commands.has_permissions(administrator=True)
     @commands.guild_only()
     async def reportchannel(self, ctx: commands.Context, action: Optional[str] = None):
         guild_id = str(ctx.guild.id)
-        data = self.load_config()
 
         if action and action.lower() == "clear":
-            if guild_id in data and "report_channel" in data[guild_id]:
-                del data[guild_id]["report_channel"]
-                self.save_config(data)
+            if self.config.remove_guild_config(guild_id, "report_channel"):
                 await ctx.send("Report channel removed.", delete_after=5)
                 print(
                     f"[REPORTCHANNEL]: Report channel removed for server {Fore.MAGENTA}{ctx.guild.name}{Style.RESET_ALL} "
@@ -325,8 +294,8 @@ class Moderation(commands.Cog):
                 )
         else:
             channel = ctx.channel
-            self.update_guild_config(guild_id, "report_channel", channel.id)
-            self.update_guild_config(guild_id, "server_name", ctx.guild.name)
+            self.config.update_guild_config(guild_id, "report_channel", channel.id)
+            self.config.update_guild_config(guild_id, "server_name", ctx.guild.name)
             await ctx.send(f"Report channel set to {channel.mention}.", delete_after=5)
             print(
                 f"[REPORTCHANNEL]: Report channel set to {Fore.BLUE}{channel.name}{Style.RESET_ALL} "
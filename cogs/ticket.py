@@ -1,19 +1,17 @@
 import discord
 from discord.ext import commands
-import json
-import os
 import asyncio
-from config import SERVER_OPTIONS 
-
-def load_config():
-    if not os.path.exists(SERVER_OPTIONS):
-        return {}
-    with open(SERVER_OPTIONS, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-def save_config(data):
-    with open(SERVER_OPTIONS, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+from utils.guildconfig import get_guild_config_store
+
+def remove_open_ticket(interaction):
+    config = get_guild_config_store(interaction.client)
+    open_tickets = config.get_guild_config(interaction.guild.id).get("open_tickets", [])
+    if interaction.channel.id in open_tickets:
+        config.update_guild_config(
+            interaction.guild.id,
+            "open_tickets",
+            [ticket_id for ticket_id in open_tickets if ticket_id != interaction.channel.id]
+        )
 
 class TicketPanel(discord.ui.View):
     def __init__(self):
@@ -37,12 +35,10 @@ class TicketPanel(discord.ui.View):
 
         channel = await guild.create_text_channel(f"ticket-{user.name}", overwrites=overwrites)
 
-        data = load_config()
-        guild_id = str(guild.id)
-        if "open_tickets" not in data[guild_id]:
-            data[guild_id]["open_tickets"] = []
-        data[guild_id]["open_tickets"].append(channel.id)
-        save_config(data)
+        config = get_guild_config_store(interaction.client)
+        open_tickets = list(config.get_guild_config(guild.id).get("open_tickets", []))
+        open_tickets.append(channel.id)
+        config.update_guild_config(guild.id, "open_tickets", open_tickets)
         
         close_view = CloseTicketView()
         embed = discord.Embed(
@@ -52,16 +48,16 @@ class TicketPanel(discord.ui.View):
         )
         await channel.send(embed=embed, view=close_view)
         
-        await self.log_ticket_action(guild, f"Ticket created by {user.mention} ({user.id}) - {channel.mention}")
+        await self.log_ticket_action(interaction, f"Ticket created by {user.mention} ({user.id}) - {channel.mention}")
         
         await interaction.response.send_message(f"Your ticket has been created: {channel.mention}", ephemeral=True)
 
-    async def log_ticket_action(self, guild, message):
-        data = load_config()
-        guild_id = str(guild.id)
-        
-        if guild_id in data and "log_channel" in data[guild_id]:
-            log_channel_id = data[guild_id]["log_channel"]
+    async def log_ticket_action(self, interaction, message):
+        guild = interaction.guild
+        guild_config = get_guild_config_store(interaction.client).get_guild_config(guild.id)
+
+        if "log_channel" in guild_config:
+            log_channel_id = guild_config["log_channel"]
             log_channel = guild.get_channel(log_channel_id)
             if log_channel:
                 embed = discord.Embed(
@@ -92,13 +88,9 @@ class CloseTicketView(discord.ui.View):
         )
         await interaction.response.send_message(embed=embed)
         
-        await self.log_ticket_action(interaction.guild, f"Ticket closed by {interaction.user.mention} ({interaction.user.id}) - {interaction.channel.mention}")
+        await self.log_ticket_action(interaction, f"Ticket closed by {interaction.user.mention} ({interaction.user.id}) - {interaction.channel.mention}")
         
-        data = load_config()
-        guild_id = str(interaction.guild.id)
-        if "open_tickets" in data[guild_id] and interaction.channel.id in data[guild_id]["open_tickets"]:
-            data[guild_id]["open_tickets"].remove(interaction.channel.id)
-            save_config(data)
+        remove_open_ticket(interaction)
 
         await asyncio.sleep(10)
         await interaction.channel.delete()
@@ -112,12 +104,12 @@ class CloseTicketView(discord.ui.View):
         modal = CloseReasonModal()
         await interaction.response.send_modal(modal)
 
-    async def log_ticket_action(self, guild, message):
-        data = load_config()
-        guild_id = str(guild.id)
-        
-        if guild_id in data and "log_channel" in data[guild_id]:
-            log_channel_id = data[guild_id]["log_channel"]
+    async def log_ticket_action(self, interaction, message):
+        guild = interaction.guild
+        guild_config = get_guild_config_store(interaction.client).get_guild_config(guild.id)
+
+        if "log_channel" in guild_config:
+            log_channel_id = guild_config["log_channel"]
             log_channel = guild.get_channel(log_channel_id)
             if log_channel:
                 embed = discord.Embed(
@@ -156,24 +148,19 @@ class CloseReasonModal(discord.ui.Modal, title="Close Ticket"):
         )
         await interaction.response.send_message(embed=embed)
         
-        await self.log_ticket_action(interaction.guild, f"Ticket closed by {interaction.user.mention} ({interaction.user.id}) - {interaction.channel.mention}\n**Reason:** {self.reason.value}")
+        await self.log_ticket_action(interaction, f"Ticket closed by {interaction.user.mention} ({interaction.user.id}) - {interaction.channel.mention}\n**Reason:** {self.reason.value}")
         
-        data = load_config()
-        guild_id = str(interaction.guild.id)
-        if "open_tickets" in data.get(guild_id, {}):
-            if interaction.channel.id in data[guild_id]["open_tickets"]:
-                data[guild_id]["open_tickets"].remove(interaction.channel.id)
-                save_config(data)
+        remove_open_ticket(interaction)
 
         await asyncio.sleep(10)
         await interaction.channel.delete()
 
-    async def log_ticket_action(self, guild, message):
-        data = load_config()
-        guild_id = str(guild.id)
-        
-        if guild_id in data and "log_channel" in data[guild_id]:
-            log_channel_id = data[guild_id]["log_channel"]
+    async def log_ticket_action(self, interaction, message):
+        guild = interaction.guild
+        guild_config = get_guild_config_store(interaction.client).get_guild_config(guild.id)
+
+        if "log_channel" in guild_config:
+            log_channel_id = guild_config["log_channel"]
             log_channel = guild.get_channel(log_channel_id)
             if log_channel:
                 embed = discord.Embed(
@@ -190,14 +177,10 @@ class Ticket(commands.Cog):
     @commands.command(name="ticket")
     @commands.has_permissions(administrator=True)
     async def ticket_setup(self, ctx):
-        data = load_config()
-        guild_id = str(ctx.guild.id)
-
-        if guild_id not in data:
-            data[guild_id] = {"server_name": ctx.guild.name}
-
-        data[guild_id]["ticket_panel"] = ctx.channel.id
-        save_config(data)
+        config = get_guild_config_store(self.bot)
+        if not config.get_guild_config(ctx.guild.id):
+            config.update_guild_config(ctx.guild.id, "server_name", ctx.guild.name)
+        config.update_guild_config(ctx.guild.id, "ticket_panel", ctx.channel.id)
 
         await ctx.channel.purge(limit=100)
 
@@ -213,8 +196,7 @@ class Ticket(commands.Cog):
     @commands.Cog.listener()
     async def on_ready(self):
         await self.bot.wait_until_ready()
-        data = load_config()
-        for guild_id, cfg in data.items():
+        for guild_id, cfg in get_guild_config_store(self.bot).guilds():
             guild = self.bot.get_guild(int(guild_id))
             if not guild:
                 continue
@@ -18,6 +18,19 @@ FONT_SIZE = 44  # Change this to the size of your font
 # Background image
 BACKGROUND_IMAGE = os.path.join(os.path.dirname(__file__), "stuff", "background.png")  # Change this to the path of your background image
 
+# Welcome image encoding
+WELCOME_IMAGE_FORMAT = "png"  # "png", "webp" or "jpeg", WebP and JPEG are much smaller uploads than PNG
+WELCOME_IMAGE_QUALITY = 85  # Quality from 1 to 100 for WebP and JPEG, ignored for PNG
+WELCOME_IMAGE_SCALE = 1.0  # Scale the 1280x720 welcome image before sending, e.g. 0.75 for 960x540
+WELCOME_IMAGE_OPTIMIZE = False  # Spend more time encoding to get a smaller file
+
+# Join raid handling for welcome images
+WELCOME_BURST_THRESHOLD = 5  # Joins allowed inside WELCOME_BURST_WINDOW before welcome cards are batched
+WELCOME_BURST_WINDOW = 30  # Seconds of joins counted towards WELCOME_BURST_THRESHOLD
+WELCOME_BATCH_INTERVAL = 15  # Seconds between batched welcome messages while a server is being raided
+WELCOME_BATCH_MODE = "collage"  # "collage" sends one image with the new members' avatars, "text" sends a plain summary
+WELCOME_COLLAGE_MAX = 24  # Most avatars shown in one collage, the rest are only counted
+
 # Bot presence settings
 BOT_PRESENCE = 4  # 0 - Playing Status; 1 - Streaming Status; 2 - Listening Status; 3 - Watching Status; >=4 - Normal Status.
 GAME_NAME_PRESENCE = "Game"  # Change this to the game you want to show in the presence
@@ -28,7 +41,32 @@ MOVIE_NAME_PRESENCE = "Movie"  # Change this to the movie you want to show in th
 
 # Server options
 SERVER_OPTIONS = os.path.join(os.path.dirname(__file__), "stuff", "serveroptions.json")  # Change this to the path of your server options file
+SERVER_OPTIONS_SAVE_DELAY = 5  # Seconds to wait and merge server options changes before writing them to disk
+SERVER_OPTIONS_BACKEND = "json"  # "json" keeps serveroptions.json, "sqlite" stores server options in SERVER_OPTIONS_DB
+SERVER_OPTIONS_DB = os.path.join(os.path.dirname(__file__), "stuff", "serveroptions.db")  # Change this to the path of your server options database, serveroptions.json is imported on first use
 LEVELS_FILE = os.path.join(os.path.dirname(__file__), "stuff", "levels.json")  # Change this to the path of your levels file
+LEVELS_BACKEND = "json"  # "json" keeps levels.json, "sqlite" stores levels in LEVELS_DB
+LEVELS_DB = os.path.join(os.path.dirname(__file__), "stuff", "levels.db")  # Change this to the path of your levels database, levels.json is imported on first use
+LEVELS_SAVE_INTERVAL = 30  # Seconds between background saves of XP changes
+LEVELS_MAX_DIRTY = 500  # Save right away once this many XP changes are waiting to be written
+LEVELS_COOLDOWN = 5  # Seconds a member must wait between messages that give XP
+LEVELS_GUILD_COOLDOWNS = {}  # Per-server cooldown overrides, e.g. {123456789012345678: 30}
+LEVELS_MAX_COOLDOWNS = 100000  # Maximum number of cooldowns kept in memory
+LEVEL_ROLE_SYNC_DELAY = 1  # Seconds to wait between role updates when syncing level rewards for a whole server
+VOICE_XP_PER_MINUTE = 10  # XP given per minute spent in voice, 0 disables voice XP
+VOICE_SETTLE_INTERVAL = 300  # Seconds between crediting XP for ongoing voice sessions
+
+USER_CACHE_TTL = 600  # Seconds to remember users fetched from Discord (leaderboard names)
+LEADERBOARD_PAGE_TTL = 30  # Seconds to reuse a rendered leaderboard page before reading it again
+
+# HTTP settings for downloading avatars and other images
+HTTP_TIMEOUT = 10  # Seconds before a download is given up
+AVATAR_MAX_BYTES = 8 * 1024 * 1024  # Largest avatar or image the bot will download
+AVATAR_CACHE_BYTES = 32 * 1024 * 1024  # Memory used to cache downloaded avatars
+
+# Image rendering
+RENDER_WORKERS = 2  # Processes used to render images (welcome cards, filters, rank cards)
+RENDER_QUEUE_SIZE = 100  # Render jobs allowed to wait before new ones are turned away
 
 # Bot Intents
 INTENTS = discord.Intents.all()  # Change this to the intents you want to use
@@ -48,7 +86,16 @@ BACK_COLOR = ButtonStyle.red  # Change this to the color you want for your back
 TAILS_IMAGE = os.path.join(os.path.dirname(__file__), "stuff", "tails.png")  # Change this to the path of your tails image
 HEADS_IMAGE = os.path.join(os.path.dirname(__file__), "stuff", "heads.png")  # Change this to the path of your heads image
 
-FILTERS_FOLDER = os.path.join(os.path.dirname(__file__), "stuff", "filters")  # Change this to the path of your filters folder
+FILTERS_FOLDER = os.path.join(os.path.dirname(__file__), "stuff", "filters")  # Change this to the path of your filters folder, every PNG in it becomes an overlay filter
+FILTER_OVERLAY_OPACITY = 0.2  # Opacity of overlay filters from 0 to 1
+FILTER_OVERLAY_PRELOAD_SIZE = 1024  # Overlays are kept resized for every Discord avatar size up to this one, bigger sizes are resized per request
+FILTER_MAX_CHAIN = 5  # Most filters that can be chained in one /filter, e.g. "sepia+portuguese"
+FILTER_CACHE_BYTES = 32 * 1024 * 1024  # Memory used to keep recent /filter results for repeat requests
+FILTER_ANIMATED_FORMAT = "gif"  # "gif" or "webp" for filtered animated avatars
+FILTER_ANIMATED_SIZE = 256  # Largest width/height of a filtered animated avatar
+FILTER_ANIMATED_MAX_FRAMES = 100  # Longer animations keep every nth frame so no more than this many are filtered
+FILTER_ANIMATED_MAX_SOURCE_FRAMES = 600  # Animations with more frames are cut off, this bounds how long one animation holds a render worker
+DISCORD_UPLOAD_LIMIT = 10 * 1024 * 1024  # Largest file the bot uploads, animations are shrunk until they fit
 
 USE_SUB_BOT = False  # Change this to True if you want to enable sub-bot support, otherwise False
 SUB_BOT_FOLDER = "bots"  # Change this to the folder where your sub-bots are located
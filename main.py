@@ -154,5 +154,17 @@ if __name__ == "__main__":
             print(f"{Fore.RED}Invalid token! Please check your token and try again.")
         except Exception as e:
             print(f"{Fore.RED}An error occurred: {e}")
+        finally:
+            # Unloads every cog so they save what they still hold in memory (levels, voice sessions)
+            if not bot.is_closed():
+                await bot.close()
+            if hasattr(bot, "web_client"):
+                await bot.web_client.close()
+            if hasattr(bot, "render_service"):
+                await bot.render_service.close()
+            if hasattr(bot, "guild_config"):
+                bot.guild_config.flush()
+                stats = bot.guild_config.stats()
+                print(f"Server options saved: {Fore.GREEN}{stats['writes']} writes, {stats['merged_writes']} merged")
 
     asyncio.run(main())
@@ -0,0 +1,82 @@
+import io
+import math
+from PIL import Image
+from config import FILTER_ANIMATED_FORMAT, FILTER_ANIMATED_SIZE, FILTER_ANIMATED_MAX_FRAMES, FILTER_ANIMATED_MAX_SOURCE_FRAMES
+from config import DISCORD_UPLOAD_LIMIT
+from utils.filters import get_filter
+
+# Animated avatars are filtered in one render job that decodes the frames in
+# order, filters the ones it keeps and encodes them. FILTER_ANIMATED_MAX_SOURCE_FRAMES
+# bounds the decoding and FILTER_ANIMATED_MAX_FRAMES the filtering and encoding,
+# so one huge GIF can only hold a worker for a bounded time.
+
+ANIMATED_EXTENSIONS = {"GIF": "gif", "WEBP": "webp"}
+
+
+def animated_extension():
+    return ANIMATED_EXTENSIONS.get(FILTER_ANIMATED_FORMAT.upper(), "gif")
+
+
+def fit_size(size, limit):
+    scale = min(1.0, limit / max(size))
+    return max(1, round(size[0] * scale)), max(1, round(size[1] * scale))
+
+
+def filter_animation(avatar_bytes, names):
+    image = Image.open(io.BytesIO(avatar_bytes))
+    loop = image.info.get("loop", 0)
+    # n_frames only walks the frame headers, longer animations are cut off
+    frame_count = min(getattr(image, "n_frames", 1), FILTER_ANIMATED_MAX_SOURCE_FRAMES)
+    # Long animations keep every nth frame, each kept frame lasts for the ones skipped
+    step = math.ceil(frame_count / FILTER_ANIMATED_MAX_FRAMES)
+    stages = [get_filter(name) for name in names]
+    size = fit_size(image.size, FILTER_ANIMATED_SIZE)
+
+    frames = []
+    durations = []
+    # Seeking one frame forward decodes only that frame, GIFs can't skip ahead any cheaper
+    for index in range(frame_count):
+        image.seek(index)
+        if index % step == 0:
+            frame = image.convert("RGBA")
+            if frame.size != size:
+                frame = frame.resize(size, Image.LANCZOS)
+            for stage in stages:
+                frame = stage(frame)
+            frames.append(frame)
+            durations.append(0)
+        durations[-1] += image.info.get("duration") or 100
+    return encode_animation(frames, durations, loop)
+
+
+def encode_frames(frames, durations, loop, format, quality):
+    output = io.BytesIO()
+    if format == "WEBP":
+        frames[0].save(
+            output, "WEBP", save_all=True, append_images=frames[1:],
+            duration=durations, loop=loop, quality=quality
+        )
+    else:
+        frames[0].save(
+            output, "GIF", save_all=True, append_images=frames[1:],
+            duration=durations, loop=loop, disposal=2, optimize=False
+        )
+    return output.getvalue()
+
+
+def encode_animation(images, durations, loop):
+    format = FILTER_ANIMATED_FORMAT.upper()
+    size = images[0].size
+    quality = 80
+    # Lower the WebP quality first, then shrink the frames until the file fits in one upload
+    while True:
+        data = encode_frames(images, durations, loop, format, quality)
+        if len(data) <= DISCORD_UPLOAD_LIMIT:
+            return data
+        if format == "WEBP" and quality > 40:
+            quality -= 20
+            continue
+        size = fit_size(size, max(size) * 3 // 4)
+        if max(size) < 64:
+            raise ValueError("The filtered animation is too large to upload.")
+        images = [image.resize(size, Image.LANCZOS) for image in images]
@@ -0,0 +1,212 @@
+import io
+import math
+import os
+from functools import lru_cache
+from PIL import Image, ImageDraw, ImageFont
+from config import FONT_PATH, FONT_SIZE, BACKGROUND_IMAGE
+from config import WELCOME_IMAGE_FORMAT, WELCOME_IMAGE_QUALITY, WELCOME_IMAGE_SCALE, WELCOME_IMAGE_OPTIMIZE
+
+# Image cards rendered from plain bytes and numbers so they can run in a worker.
+# The static layers of every card are built once per process and reused.
+
+RANK_CARD_SIZE = (934, 282)
+RANK_AVATAR_SIZE = 200
+RANK_BAR_BOX = (270, 175, 890, 215)
+
+WELCOME_CARD_SIZE = (1280, 720)
+WELCOME_AVATAR_SIZE = 400
+WELCOME_BORDER_SIZE = 12
+
+IMAGE_EXTENSIONS = {"PNG": "png", "WEBP": "webp", "JPEG": "jpg"}
+
+
+def circle_mask(size):
+    mask = Image.new("L", (size, size), 0)
+    ImageDraw.Draw(mask).ellipse((0, 0, size, size), fill=255)
+    return mask
+
+
+@lru_cache(maxsize=1)
+def rank_card_template():
+    width, height = RANK_CARD_SIZE
+    background = Image.open(BACKGROUND_IMAGE).convert("RGBA")
+    # Crop to the card's aspect ratio before resizing so the image isn't squashed
+    crop_height = background.width * height // width
+    top = (background.height - crop_height) // 2
+    background = background.crop((0, top, background.width, top + crop_height)).resize(RANK_CARD_SIZE, Image.LANCZOS)
+
+    panel = Image.new("RGBA", RANK_CARD_SIZE, (0, 0, 0, 0))
+    panel_draw = ImageDraw.Draw(panel)
+    panel_draw.rounded_rectangle((20, 20, width - 20, height - 20), radius=24, fill=(0, 0, 0, 150))
+    left, top, right, bottom = RANK_BAR_BOX
+    panel_draw.rounded_rectangle(RANK_BAR_BOX, radius=(bottom - top) // 2, fill=(70, 70, 70, 255))
+    panel_draw.rounded_rectangle(
+        (left - 3, top - 3, right + 3, bottom + 3), radius=(bottom - top) // 2 + 3,
+        outline=(255, 255, 255, 255), width=3
+    )
+    background.alpha_composite(panel)
+
+    ring_size = RANK_AVATAR_SIZE + 12
+    ring = Image.new("RGBA", (ring_size, ring_size), (0, 0, 0, 0))
+    ImageDraw.Draw(ring).ellipse((0, 0, ring_size - 1, ring_size - 1), outline=(255, 255, 255, 255), width=6)
+    background.alpha_composite(ring, (40, (height - ring_size) // 2))
+
+    fonts = {
+        "name": ImageFont.truetype(FONT_PATH, 40),
+        "stats": ImageFont.truetype(FONT_PATH, 28),
+        "small": ImageFont.truetype(FONT_PATH, 22)
+    }
+    return background, circle_mask(RANK_AVATAR_SIZE), fonts
+
+
+def render_rank_card(avatar_bytes, name, rank, total, level, xp, required_xp):
+    template, mask, fonts = rank_card_template()
+    card = template.copy()
+    width, height = RANK_CARD_SIZE
+
+    avatar = Image.open(io.BytesIO(avatar_bytes)).convert("RGBA")
+    avatar = avatar.resize((RANK_AVATAR_SIZE, RANK_AVATAR_SIZE), Image.BILINEAR)
+    card.paste(avatar, (46, (height - RANK_AVATAR_SIZE) // 2), mask)
+
+    left, top, right, bottom = RANK_BAR_BOX
+    draw = ImageDraw.Draw(card)
+    progress = max(0.0, min(1.0, xp / required_xp)) if required_xp else 0.0
+    fill_right = left + int((right - left) * progress)
+    if fill_right - left >= bottom - top:
+        draw.rounded_rectangle((left, top, fill_right, bottom), radius=(bottom - top) // 2, fill=(88, 101, 242, 255))
+
+    draw.text((left, 50), name, font=fonts["name"], fill=(255, 255, 255))
+    rank_text = f"Rank #{rank} of {total}" if rank else "Unranked"
+    draw.text((left, 110), rank_text, font=fonts["stats"], fill=(200, 200, 200))
+    level_text = f"Level {level}"
+    level_width = draw.textlength(level_text, font=fonts["stats"])
+    draw.text((right - level_width, 110), level_text, font=fonts["stats"], fill=(255, 255, 255))
+    xp_text = f"{xp} / {required_xp} XP"
+    xp_width = draw.textlength(xp_text, font=fonts["small"])
+    draw.text((right - xp_width, bottom + 10), xp_text, font=fonts["small"], fill=(200, 200, 200))
+
+    output = io.BytesIO()
+    card.save(output, "PNG", compress_level=1)
+    return output.getvalue()
+
+
+def asset_version(*paths):
+    # Changes whenever one of the files is replaced or edited
+    return tuple(os.stat(path).st_mtime_ns for path in paths)
+
+
+@lru_cache(maxsize=1)
+def build_welcome_card_template(version):
+    width, height = WELCOME_CARD_SIZE
+    background = Image.open(BACKGROUND_IMAGE).convert("RGBA").resize(WELCOME_CARD_SIZE)
+
+    contour_size = WELCOME_AVATAR_SIZE + WELCOME_BORDER_SIZE * 2
+    contour = Image.new("RGBA", (contour_size, contour_size), (255, 255, 255, 0))
+    ImageDraw.Draw(contour).ellipse(
+        (0, 0, contour_size - 1, contour_size - 1),
+        outline=(255, 255, 255, 255),
+        width=WELCOME_BORDER_SIZE
+    )
+    contour_pos = ((width - contour_size) // 2, (height - contour_size) // 2 - 60)
+    background.paste(contour, contour_pos, contour)
+
+    avatar_pos = (contour_pos[0] + WELCOME_BORDER_SIZE, contour_pos[1] + WELCOME_BORDER_SIZE)
+    text_y = contour_pos[1] + contour_size + 40
+    font = ImageFont.truetype(FONT_PATH, FONT_SIZE)
+    return background, circle_mask(WELCOME_AVATAR_SIZE), font, avatar_pos, text_y
+
+
+def welcome_card_template():
+    return build_welcome_card_template(asset_version(BACKGROUND_IMAGE, FONT_PATH))
+
+
+def compose_welcome_card(avatar_bytes, text):
+    template, mask, font, avatar_pos, text_y = welcome_card_template()
+    card = template.copy()
+
+    avatar = Image.open(io.BytesIO(avatar_bytes)).convert("RGBA")
+    avatar = avatar.resize((WELCOME_AVATAR_SIZE, WELCOME_AVATAR_SIZE), Image.LANCZOS)
+    card.paste(avatar, avatar_pos, mask)
+
+    draw = ImageDraw.Draw(card)
+    text_bbox = draw.textbbox((0, 0), text, font=font)
+    text_x = (WELCOME_CARD_SIZE[0] - (text_bbox[2] - text_bbox[0])) // 2
+    draw.text((text_x, text_y), text, font=font, fill=(255, 255, 255))
+    return card
+
+
+def encode_image(image, format="PNG", quality=85, scale=1.0, optimize=False):
+    format = format.upper()
+    if scale != 1.0:
+        image = image.resize((round(image.width * scale), round(image.height * scale)), Image.LANCZOS)
+
+    output = io.BytesIO()
+    if format == "JPEG":
+        image.convert("RGB").save(output, "JPEG", quality=quality, optimize=optimize)
+    elif format == "WEBP":
+        # method 6 is the slowest and smallest WebP setting, 4 is Pillow's default
+        image.save(output, "WEBP", quality=quality, method=6 if optimize else 4)
+    else:
+        image.save(output, "PNG", optimize=optimize)
+    return output.getvalue()
+
+
+def encode_welcome_image(image):
+    # Welcome images are fully opaque, dropping the alpha channel makes every format smaller
+    return encode_image(
+        image.convert("RGB"), WELCOME_IMAGE_FORMAT, WELCOME_IMAGE_QUALITY,
+        WELCOME_IMAGE_SCALE, WELCOME_IMAGE_OPTIMIZE
+    )
+
+
+def welcome_image_filename(name):
+    return f"{name}.{IMAGE_EXTENSIONS.get(WELCOME_IMAGE_FORMAT.upper(), 'png')}"
+
+
+def render_welcome_card(avatar_bytes, text):
+    return encode_welcome_image(compose_welcome_card(avatar_bytes, text))
+
+
+@lru_cache(maxsize=1)
+def build_collage_template(version):
+    background = Image.open(BACKGROUND_IMAGE).convert("RGBA").resize(WELCOME_CARD_SIZE)
+    return background, ImageFont.truetype(FONT_PATH, FONT_SIZE)
+
+
+def render_join_collage(avatars, text):
+    # avatars is a list of image bytes, None where the download failed
+    template, font = build_collage_template(asset_version(BACKGROUND_IMAGE, FONT_PATH))
+    card = template.copy()
+    width, height = WELCOME_CARD_SIZE
+    area_width, area_height = width - 80, height - 180
+
+    count = max(len(avatars), 1)
+    # Pick the column count that gives the largest avatars inside the area
+    columns = max(range(1, count + 1), key=lambda c: min(area_width // c, area_height // math.ceil(count / c)))
+    rows = math.ceil(count / columns)
+    cell = min(area_width // columns, area_height // rows)
+    size = cell - 16
+    mask = circle_mask(size)
+    placeholder = Image.new("RGBA", (size, size), (70, 70, 70, 255))
+    top = 40 + (area_height - rows * cell) // 2
+
+    for index, avatar_bytes in enumerate(avatars):
+        row, column = divmod(index, columns)
+        in_row = min(columns, len(avatars) - row * columns)
+        left = (width - in_row * cell) // 2
+        if avatar_bytes is None:
+            avatar = placeholder
+        else:
+            avatar = Image.open(io.BytesIO(avatar_bytes)).convert("RGBA").resize((size, size), Image.BILINEAR)
+        card.paste(avatar, (left + column * cell + 8, top + row * cell + 8), mask)
+
+    draw = ImageDraw.Draw(card)
+    text_bbox = draw.textbbox((0, 0), text, font=font)
+    draw.text(((width - (text_bbox[2] - text_bbox[0])) // 2, height - 110), text, font=font, fill=(255, 255, 255))
+    return encode_welcome_image(card)
+
+
+def render_color_banner(rgb, size=(600, 200)):
+    output = io.BytesIO()
+    Image.new("RGB", size, rgb).save(output, format="PNG")
+    return output.getvalue()
@@ -0,0 +1,67 @@
+import heapq
+import time
+
+
+class CooldownTracker:
+    # Cooldowns keyed by (guild_id, member_id). Expired entries are dropped in
+    # bulk from a heap ordered by expiry, and max_size caps memory by evicting
+    # the entries closest to expiring first.
+    def __init__(self, default_duration, durations=None, max_size=100_000, clock=time.monotonic):
+        self.default_duration = default_duration
+        self.durations = durations or {}
+        self.max_size = max_size
+        self.clock = clock
+        self.expires = {}
+        self.heap = []
+        self.expired_count = 0
+        self.evicted_count = 0
+
+    def __len__(self):
+        return len(self.expires)
+
+    def duration(self, guild_id):
+        return self.durations.get(guild_id, self.default_duration)
+
+    def hit(self, guild_id, member_id):
+        # Returns True and starts a new cooldown if the member was not on cooldown
+        now = self.clock()
+        self.expire(now)
+
+        key = (guild_id, member_id)
+        expires = self.expires.get(key)
+        if expires is not None and expires > now:
+            return False
+
+        expires = now + self.duration(guild_id)
+        self.expires[key] = expires
+        heapq.heappush(self.heap, (expires, key))
+        self.evict()
+        return True
+
+    def expire(self, now):
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            expires, key = heapq.heappop(heap)
+            # Skip heap entries that were replaced by a newer cooldown
+            if self.expires.get(key) == expires:
+                del self.expires[key]
+                self.expired_count += 1
+
+    def evict(self):
+        heap = self.heap
+        while len(self.expires) > self.max_size and heap:
+            expires, key = heapq.heappop(heap)
+            if self.expires.get(key) == expires:
+                del self.expires[key]
+                self.evicted_count += 1
+        # Stale heap entries pile up when members are hit repeatedly, rebuild once they dominate
+        if len(heap) > 2 * max(len(self.expires), 1024):
+            self.heap = [(expires, key) for key, expires in self.expires.items()]
+            heapq.heapify(self.heap)
+
+    def stats(self):
+        return {
+            "size": len(self.expires),
+            "expired": self.expired_count,
+            "evicted": self.evicted_count
+        }
@@ -0,0 +1,155 @@
+import io
+import os
+from functools import lru_cache, partial
+from PIL import Image, ImageOps
+from config import FILTERS_FOLDER, FILTER_OVERLAY_OPACITY, FILTER_MAX_CHAIN, FILTER_OVERLAY_PRELOAD_SIZE
+
+# Every filter is a stage that takes an RGBA image and returns an RGBA image, so
+# a chain like "sepia+portuguese" decodes the avatar once and encodes it once.
+
+# 3x4 colour matrices for Image.convert, one row of (r, g, b, offset) weights per output band
+COLOR_MATRICES = {
+    "sepia": (
+        0.393, 0.769, 0.189, 0,
+        0.349, 0.686, 0.168, 0,
+        0.272, 0.534, 0.131, 0
+    )
+}
+
+
+def apply_color_matrix(image, matrix):
+    # Runs over every pixel in one C pass, the alpha band is kept as it was
+    if len(matrix) == 9:
+        matrix = matrix[0:3] + (0,) + matrix[3:6] + (0,) + matrix[6:9] + (0,)
+    filtered_image = image.convert("RGB").convert("RGB", matrix)
+    if image.mode == "RGBA":
+        filtered_image.putalpha(image.getchannel("A"))
+    return filtered_image
+
+
+def grayscale(image):
+    filtered_image = ImageOps.grayscale(image).convert("RGBA")
+    filtered_image.putalpha(image.getchannel("A"))
+    return filtered_image
+
+
+def invert(image):
+    filtered_image = ImageOps.invert(image.convert("RGB"))
+    filtered_image.putalpha(image.getchannel("A"))
+    return filtered_image
+
+
+DISCORD_AVATAR_SIZES = (64, 128, 256, 512, 1024, 2048, 4096)
+
+
+def fade(filter_image):
+    alpha = filter_image.getchannel("A").point([int(p * FILTER_OVERLAY_OPACITY) for p in range(256)])
+    filter_image.putalpha(alpha)
+    return filter_image
+
+
+@lru_cache(maxsize=32)
+def overlay_source(path, version):
+    # Read once per file version, version is the file's mtime
+    return Image.open(path).convert("RGBA")
+
+
+@lru_cache(maxsize=128)
+def cached_overlay_variant(path, version, size):
+    source = overlay_source(path, version)
+    return fade(source.copy() if source.size == size else source.resize(size))
+
+
+def overlay_variant(path, version, size):
+    # A 4096px RGBA variant is 64 MB, so only sizes up to the preload size are kept
+    if max(size) <= FILTER_OVERLAY_PRELOAD_SIZE:
+        return cached_overlay_variant(path, version, size)
+    return fade(overlay_source(path, version).resize(size))
+
+
+def preload_overlays():
+    # Builds the variants for the usual avatar sizes ahead of the first request
+    for path in overlay_paths().values():
+        version = os.stat(path).st_mtime_ns
+        for size in DISCORD_AVATAR_SIZES:
+            if size <= FILTER_OVERLAY_PRELOAD_SIZE:
+                cached_overlay_variant(path, version, (size, size))
+
+
+def apply_overlay(path, image):
+    overlay = overlay_variant(path, os.stat(path).st_mtime_ns, image.size)
+    return Image.alpha_composite(image, overlay)
+
+
+BUILTIN_FILTERS = {"grayscale": grayscale, "invert": invert}
+for name, matrix in COLOR_MATRICES.items():
+    BUILTIN_FILTERS[name] = partial(apply_color_matrix, matrix=matrix)
+
+overlay_filters = {}
+overlay_version = None
+
+
+def overlay_paths():
+    # Every PNG in FILTERS_FOLDER is an overlay filter named after the file
+    global overlay_filters, overlay_version
+    try:
+        version = os.stat(FILTERS_FOLDER).st_mtime_ns
+    except OSError:
+        version = None
+    if version != overlay_version:
+        overlay_filters = {}
+        if version is not None:
+            for file_name in sorted(os.listdir(FILTERS_FOLDER)):
+                name, extension = os.path.splitext(file_name)
+                name = name.lower()
+                if extension.lower() == ".png" and name not in BUILTIN_FILTERS:
+                    overlay_filters[name] = os.path.join(FILTERS_FOLDER, file_name)
+        overlay_version = version
+    return overlay_filters
+
+
+def filter_names():
+    return list(BUILTIN_FILTERS) + list(overlay_paths())
+
+
+def get_filter(name):
+    if name in BUILTIN_FILTERS:
+        return BUILTIN_FILTERS[name]
+    path = overlay_paths().get(name)
+    if path is None:
+        raise ValueError(f"Unknown filter: {name}")
+    return partial(apply_overlay, path)
+
+
+def chain_version(names):
+    # Changes when an overlay used by the chain is edited or replaced
+    paths = overlay_paths()
+    version = []
+    for name in names:
+        if name in paths:
+            try:
+                version.append(os.stat(paths[name]).st_mtime_ns)
+            except OSError:
+                version.append(None)
+    return tuple(version)
+
+
+def parse_filter_chain(text):
+    names = [name.strip().lower() for name in text.split("+") if name.strip()]
+    if not names:
+        raise ValueError("No filter given.")
+    if len(names) > FILTER_MAX_CHAIN:
+        raise ValueError(f"You can chain at most {FILTER_MAX_CHAIN} filters.")
+    for name in names:
+        get_filter(name)
+    return names
+
+
+def apply_filters(avatar_bytes, names):
+    image = Image.open(io.BytesIO(avatar_bytes)).convert("RGBA")
+    for name in names:
+        image = get_filter(name)(image)
+
+    output_buffer = io.BytesIO()
+    image.save(output_buffer, format='PNG')
+    return output_buffer.getvalue()
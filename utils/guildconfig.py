@@ -0,0 +1,277 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+from colorama import Fore
+from config import SERVER_OPTIONS, SERVER_OPTIONS_SAVE_DELAY, SERVER_OPTIONS_BACKEND, SERVER_OPTIONS_DB, DEBUG_MODE
+from utils.files import write_atomic
+
+
+class GuildConfigStore:
+    # Single in-memory copy of SERVER_OPTIONS shared by every cog.
+    # Reads never touch the disk; changes are merged and written behind
+    # every SERVER_OPTIONS_SAVE_DELAY seconds, and once more on shutdown.
+    def __init__(self, path=SERVER_OPTIONS, save_delay=SERVER_OPTIONS_SAVE_DELAY):
+        self.path = path
+        self.save_delay = save_delay
+        self.data = self.load()
+        self.pending_changes = 0
+        self.writes = 0
+        self.merged_writes = 0
+        self._flush_task = None
+        self._write_lock = threading.Lock()
+        self._written_version = 0
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save(self):
+        self.pending_changes += 1
+        if self._flush_task is not None:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        self._flush_task = loop.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        try:
+            await asyncio.sleep(self.save_delay)
+        finally:
+            self._flush_task = None
+        snapshot = self._take_snapshot()
+        if snapshot is not None:
+            await asyncio.to_thread(self._write, *snapshot)
+
+    def _take_snapshot(self):
+        if not self.pending_changes:
+            return None
+        self.writes += 1
+        self.merged_writes += self.pending_changes - 1
+        self.pending_changes = 0
+        return self.writes, json.dumps(self.data, indent=4, ensure_ascii=False)
+
+    def _write(self, version, payload):
+        with self._write_lock:
+            # A newer snapshot may already be on disk if shutdown flushed first
+            if version <= self._written_version:
+                return
+            write_atomic(self.path, payload)
+            self._written_version = version
+        if DEBUG_MODE:
+            print(f"{Fore.CYAN}[CONFIG] Saved server options ({self.merged_writes} writes merged so far)")
+
+    def flush(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        snapshot = self._take_snapshot()
+        if snapshot is not None:
+            self._write(*snapshot)
+
+    def stats(self):
+        return {
+            "writes": self.writes,
+            "merged_writes": self.merged_writes,
+            "pending_changes": self.pending_changes
+        }
+
+    def guilds(self):
+        return list(self.data.items())
+
+    def get_guild_config(self, guild_id):
+        # The returned dict is the live entry, treat it as read-only
+        return self.data.get(str(guild_id), {})
+
+    def update_guild_config(self, guild_id, key, value):
+        guild_id = str(guild_id)
+        if guild_id not in self.data:
+            self.data[guild_id] = {"server_name": "Unknown"}
+        self.data[guild_id][key] = value
+        self.save()
+
+    def remove_guild_config(self, guild_id, key):
+        guild_config = self.data.get(str(guild_id))
+        if not guild_config or key not in guild_config:
+            return False
+        del guild_config[key]
+        self.save()
+        return True
+
+    def update_server_name(self, guild_id, name):
+        guild_config = self.data.get(str(guild_id))
+        if guild_config is None or guild_config.get("server_name") == name:
+            return False
+        guild_config["server_name"] = name
+        self.save()
+        return True
+
+
+class SQLiteGuildConfigStore:
+    # Same interface as GuildConfigStore, but every change is a single row
+    # update in SERVER_OPTIONS_DB instead of a rewrite of the whole file.
+    COLUMNS = ("server_name", "log_channel", "report_channel", "autorole", "ticket_panel")
+
+    def __init__(self, path=SERVER_OPTIONS_DB, json_path=SERVER_OPTIONS):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.create_tables()
+        self.writes = 0
+        if not self.db.execute("SELECT 1 FROM meta WHERE key = 'migrated_json'").fetchone():
+            self.migrate_from_json(json_path)
+        self.data = self.load()
+
+    def create_tables(self):
+        with self.db:
+            self.db.executescript("""
+                CREATE TABLE IF NOT EXISTS guilds (
+                    guild_id TEXT PRIMARY KEY,
+                    server_name TEXT NOT NULL DEFAULT 'Unknown',
+                    log_channel INTEGER,
+                    report_channel INTEGER,
+                    autorole INTEGER,
+                    ticket_panel INTEGER
+                );
+                CREATE TABLE IF NOT EXISTS open_tickets (
+                    guild_id TEXT NOT NULL,
+                    channel_id INTEGER NOT NULL,
+                    PRIMARY KEY (guild_id, channel_id)
+                );
+                CREATE TABLE IF NOT EXISTS guild_options (
+                    guild_id TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    PRIMARY KEY (guild_id, key)
+                );
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            """)
+
+    def migrate_from_json(self, json_path):
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+
+        with self.db:
+            for guild_id, guild_config in data.items():
+                self._ensure_guild(guild_id)
+                for key, value in guild_config.items():
+                    self._write_key(guild_id, key, value)
+            self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_json', ?)", (json_path,))
+
+        if data:
+            print(f"{Fore.CYAN}[CONFIG] Imported {len(data)} servers from {json_path} into {self.path}")
+
+    def load(self):
+        data = {}
+        columns = ", ".join(self.COLUMNS)
+        for row in self.db.execute(f"SELECT guild_id, {columns} FROM guilds"):
+            data[row[0]] = {key: value for key, value in zip(self.COLUMNS, row[1:]) if value is not None}
+        for guild_id, channel_id in self.db.execute("SELECT guild_id, channel_id FROM open_tickets ORDER BY rowid"):
+            data.setdefault(guild_id, {}).setdefault("open_tickets", []).append(channel_id)
+        for guild_id, key, value in self.db.execute("SELECT guild_id, key, value FROM guild_options"):
+            data.setdefault(guild_id, {})[key] = json.loads(value)
+        return data
+
+    def _ensure_guild(self, guild_id):
+        self.db.execute("INSERT OR IGNORE INTO guilds (guild_id) VALUES (?)", (guild_id,))
+
+    def _write_key(self, guild_id, key, value):
+        if key in self.COLUMNS:
+            self.db.execute(f"UPDATE guilds SET {key} = ? WHERE guild_id = ?", (value, guild_id))
+        elif key == "open_tickets":
+            current = {row[0] for row in self.db.execute(
+                "SELECT channel_id FROM open_tickets WHERE guild_id = ?", (guild_id,)
+            )}
+            wanted = set(value or [])
+            self.db.executemany(
+                "DELETE FROM open_tickets WHERE guild_id = ? AND channel_id = ?",
+                [(guild_id, channel_id) for channel_id in current - wanted]
+            )
+            self.db.executemany(
+                "INSERT INTO open_tickets (guild_id, channel_id) VALUES (?, ?)",
+                [(guild_id, channel_id) for channel_id in value or [] if channel_id not in current]
+            )
+        else:
+            self.db.execute(
+                "INSERT INTO guild_options (guild_id, key, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (guild_id, key) DO UPDATE SET value = excluded.value",
+                (guild_id, key, json.dumps(value))
+            )
+
+    def _delete_key(self, guild_id, key):
+        if key == "server_name":
+            self.db.execute("UPDATE guilds SET server_name = 'Unknown' WHERE guild_id = ?", (guild_id,))
+        elif key in self.COLUMNS:
+            self.db.execute(f"UPDATE guilds SET {key} = NULL WHERE guild_id = ?", (guild_id,))
+        elif key == "open_tickets":
+            self.db.execute("DELETE FROM open_tickets WHERE guild_id = ?", (guild_id,))
+        else:
+            self.db.execute("DELETE FROM guild_options WHERE guild_id = ? AND key = ?", (guild_id, key))
+
+    def flush(self):
+        self.db.commit()
+
+    def stats(self):
+        return {"writes": self.writes, "merged_writes": 0, "pending_changes": 0}
+
+    def guilds(self):
+        return list(self.data.items())
+
+    def get_guild_config(self, guild_id):
+        # The returned dict is the live entry, treat it as read-only
+        return self.data.get(str(guild_id), {})
+
+    def update_guild_config(self, guild_id, key, value):
+        guild_id = str(guild_id)
+        with self.db:
+            if guild_id not in self.data:
+                self._ensure_guild(guild_id)
+                self.data[guild_id] = {"server_name": "Unknown"}
+            self._write_key(guild_id, key, value)
+        self.data[guild_id][key] = value
+        self.writes += 1
+
+    def remove_guild_config(self, guild_id, key):
+        guild_id = str(guild_id)
+        guild_config = self.data.get(guild_id)
+        if not guild_config or key not in guild_config:
+            return False
+        with self.db:
+            self._delete_key(guild_id, key)
+        del guild_config[key]
+        self.writes += 1
+        return True
+
+    def update_server_name(self, guild_id, name):
+        guild_config = self.data.get(str(guild_id))
+        if guild_config is None or guild_config.get("server_name") == name:
+            return False
+        self.update_guild_config(guild_id, "server_name", name)
+        return True
+
+
+def get_guild_config_store(bot):
+    store = getattr(bot, "guild_config", None)
+    if store is None:
+        if SERVER_OPTIONS_BACKEND == "sqlite":
+            store = SQLiteGuildConfigStore()
+        else:
+            store = GuildConfigStore()
+        bot.guild_config = store
+    return store
@@ -0,0 +1,40 @@
+import time
+from collections import deque
+
+
+class JoinBurstTracker:
+    # Sliding window of recent join times per guild. A guild enters burst mode
+    # once more than threshold joins land inside window seconds and leaves it
+    # only when settle() sees the rate back under the threshold.
+    def __init__(self, threshold, window, clock=time.monotonic):
+        self.threshold = threshold
+        self.window = window
+        self.clock = clock
+        self.joins = {}
+        self.bursting = set()
+
+    def trim(self, guild_id, now):
+        joins = self.joins.get(guild_id)
+        if joins is None:
+            return 0
+        cutoff = now - self.window
+        while joins and joins[0] <= cutoff:
+            joins.popleft()
+        if not joins:
+            del self.joins[guild_id]
+            return 0
+        return len(joins)
+
+    def record(self, guild_id):
+        # Returns True if this join should be batched instead of getting its own card
+        now = self.clock()
+        self.joins.setdefault(guild_id, deque()).append(now)
+        if self.trim(guild_id, now) > self.threshold:
+            self.bursting.add(guild_id)
+        return guild_id in self.bursting
+
+    def settle(self, guild_id):
+        # Returns True while the guild is still joining faster than the threshold
+        if self.trim(guild_id, self.clock()) <= self.threshold:
+            self.bursting.discard(guild_id)
+        return guild_id in self.bursting
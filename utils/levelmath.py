@@ -0,0 +1,24 @@
+from math import isqrt
+
+# Level L needs 100 + (L - 1) * 50 XP to reach L + 1, so the total XP earned
+# when reaching level L is the arithmetic series 25 * (L - 1) * (L + 2).
+
+
+def required_xp(level):
+    return 100 + (level - 1) * 50
+
+
+def total_xp(level, xp=0):
+    return 25 * (level - 1) * (level + 2) + xp
+
+
+def level_from_total_xp(total):
+    # Returns (level, xp) with xp carried over inside the level
+    total = max(0, total)
+    level = max(1, (isqrt(225 + 4 * total) - 5) // 10)
+    # isqrt floors, nudge the estimate in case of an off-by-one at the boundary
+    while total_xp(level + 1) <= total:
+        level += 1
+    while level > 1 and total_xp(level) > total:
+        level -= 1
+    return level, total - total_xp(level)
@@ -0,0 +1,156 @@
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+from itertools import islice
+
+# Level data as NDJSON, one record per line:
+#   {"type": "guild", "guild_id": "1", "server_name": "..."}
+#   {"type": "member", "guild_id": "1", "member_id": "2", "xp": 10, "level": 3}
+# Records are written and read one line at a time, so memory does not grow with the file.
+
+IMPORT_CHUNK_SIZE = 1000
+
+
+def write_ndjson(store, fileobj, guild_ids=None):
+    guilds = 0
+    members = 0
+    for guild_id, server_name in store.iter_guilds():
+        if guild_ids is not None and guild_id not in guild_ids:
+            continue
+        fileobj.write(json.dumps({"type": "guild", "guild_id": guild_id, "server_name": server_name}) + "\n")
+        guilds += 1
+        for member_id, xp, level in store.iter_members(guild_id):
+            fileobj.write(json.dumps({
+                "type": "member", "guild_id": guild_id, "member_id": member_id, "xp": xp, "level": level
+            }) + "\n")
+            members += 1
+    return guilds, members
+
+
+def export_ndjson_file(store, guild_ids=None):
+    # Writes the export to a temporary file and returns (path, (guilds, members)),
+    # the caller removes the file once it has been sent
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".ndjson", delete=False) as fileobj:
+        try:
+            counts = write_ndjson(store, fileobj, guild_ids)
+        except BaseException:
+            fileobj.close()
+            os.remove(fileobj.name)
+            raise
+    return fileobj.name, counts
+
+
+def parse_id(value, name, line):
+    value = str(value)
+    if not value.isdigit():
+        raise ValueError(f"Line {line}: `{name}` must be a Discord ID, got {value!r}")
+    return value
+
+
+def parse_record(text, line):
+    try:
+        record = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Line {line}: invalid JSON ({e.msg})")
+    if not isinstance(record, dict):
+        raise ValueError(f"Line {line}: expected an object")
+
+    record_type = record.get("type")
+    guild_id = parse_id(record.get("guild_id"), "guild_id", line)
+    if record_type == "guild":
+        server_name = record.get("server_name")
+        if not isinstance(server_name, str):
+            raise ValueError(f"Line {line}: `server_name` must be a string")
+        return ("guild", guild_id, server_name)
+    if record_type == "member":
+        member_id = parse_id(record.get("member_id"), "member_id", line)
+        xp = record.get("xp")
+        level = record.get("level")
+        if type(xp) is not int or xp < 0:
+            raise ValueError(f"Line {line}: `xp` must be a non-negative integer")
+        if type(level) is not int or level < 1:
+            raise ValueError(f"Line {line}: `level` must be a positive integer")
+        return ("member", guild_id, member_id, xp, level)
+    raise ValueError(f"Line {line}: unknown record type {record_type!r}")
+
+
+def read_ndjson(fileobj, guild_id=None):
+    # Yields validated records, skipping other guilds when guild_id is given
+    for line, text in enumerate(fileobj, start=1):
+        if isinstance(text, bytes):
+            text = text.decode("utf-8")
+        text = text.strip()
+        if not text:
+            continue
+        record = parse_record(text, line)
+        if guild_id is None or record[1] == str(guild_id):
+            yield record
+
+
+def validate_ndjson(fileobj, guild_id=None):
+    for _ in read_ndjson(fileobj, guild_id):
+        pass
+
+
+async def import_ndjson(store, fileobj, guild_id=None):
+    # Validates and applies records in chunks, returns (guilds, members) imported.
+    # Seekable files are validated completely first so a bad line imports nothing.
+    if fileobj.seekable():
+        await asyncio.to_thread(validate_ndjson, fileobj, guild_id)
+        fileobj.seek(0)
+    records = read_ndjson(fileobj, guild_id)
+    names = {}
+    guilds = 0
+    members = 0
+    while True:
+        chunk = list(islice(records, IMPORT_CHUNK_SIZE))
+        if not chunk:
+            break
+        by_guild = {}
+        for record in chunk:
+            if record[0] == "guild":
+                names[record[1]] = record[2]
+                guilds += 1
+            else:
+                by_guild.setdefault(record[1], []).append(record[2:])
+        for record_guild_id, member_records in by_guild.items():
+            store.update_members(record_guild_id, names.get(record_guild_id, "Unknown"), member_records)
+            members += len(member_records)
+        if store.incremental_saves:
+            await store.save()
+        # Let the event loop breathe between chunks
+        await asyncio.sleep(0)
+    # The JSON store rewrites the whole file on every save, so it is saved once here
+    await store.save()
+    return guilds, members
+
+
+def main():
+    from utils.levelstore import create_level_store
+
+    parser = argparse.ArgumentParser(description="Export or import level data as NDJSON.")
+    parser.add_argument("action", choices=["export", "import"])
+    parser.add_argument("path")
+    parser.add_argument("--guild", help="Only export or import this server ID")
+    args = parser.parse_args()
+
+    store = create_level_store()
+
+    async def run():
+        if args.action == "export":
+            with open(args.path, "w", encoding="utf-8") as f:
+                guilds, members = write_ndjson(store, f, {args.guild} if args.guild else None)
+        else:
+            with open(args.path, "r", encoding="utf-8") as f:
+                guilds, members = await import_ndjson(store, f, args.guild)
+        await store.save()
+        store.close()
+        print(f"[LEVELING] {args.action.capitalize()}ed {guilds} servers and {members} members.")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from colorama import Fore
+from config import LEVELS_FILE, LEVELS_BACKEND, LEVELS_DB
+from utils.files import write_atomic
+from utils.ranking import RankIndex
+from utils.membertable import MemberTable
+
+
+def load_levels_file(path):
+    if os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            # Keep the broken file around so it can still be recovered by hand
+            backup_path = f"{path}.corrupt-{int(time.time())}"
+            os.replace(path, backup_path)
+            print(f"[LEVELING] The JSON file is corrupted, moved it to {backup_path}. Creating a new one...")
+            return {}
+    return {}
+
+
+class JSONLevelStore:
+    # Keeps the whole levels.json document in memory, XP changes only mark
+    # the guild dirty and save() rewrites the file with the dirty guilds re-serialized.
+    # Members are held in a compact MemberTable per guild rather than one dict each.
+    # Every save rewrites the whole file, so bulk writers should save once at the end.
+    incremental_saves = False
+
+    def __init__(self, path=LEVELS_FILE):
+        self.path = path
+        self.levels = {
+            guild_id: {"server_name": guild.get("server_name", "Unknown"), "members": MemberTable.from_json(guild.get("members", {}))}
+            for guild_id, guild in load_levels_file(path).items()
+        }
+        # Serialized JSON per guild, only dirty guilds are re-serialized on save
+        self.guild_payloads = {guild_id: self.dump_guild(guild_id) for guild_id in self.levels}
+        self.dirty_guilds = set()
+        self.dirty_changes = 0
+        self.save_lock = asyncio.Lock()
+        # Built the first time a guild's ranking is needed, then kept up to date
+        self.rankings = {}
+
+    def dump_guild(self, guild_id):
+        guild = self.levels[guild_id]
+        return f'{{"server_name":{json.dumps(guild["server_name"])},"members":{guild["members"].to_json()}}}'
+
+    def mark_dirty(self, guild_id):
+        self.dirty_guilds.add(guild_id)
+        self.dirty_changes += 1
+
+    def get_member(self, guild_id, member_id):
+        guild = self.levels.get(str(guild_id))
+        if guild is None:
+            return None
+        record = guild["members"].get(member_id)
+        return {"xp": record[0], "level": record[1]} if record else None
+
+    def update_member(self, guild_id, guild_name, member_id, xp, level):
+        guild_id = str(guild_id)
+        guild = self.levels.get(guild_id)
+        if guild is None:
+            guild = self.levels[guild_id] = {"server_name": guild_name, "members": MemberTable()}
+        else:
+            guild["server_name"] = guild_name
+        ranking = self.rankings.get(guild_id)
+        if ranking is not None:
+            ranking.update(member_id, guild["members"].get(member_id), xp, level)
+        guild["members"].set(member_id, xp, level)
+        self.mark_dirty(guild_id)
+
+    def update_members(self, guild_id, guild_name, records):
+        # records is an iterable of (member_id, xp, level)
+        guild_id = str(guild_id)
+        guild = self.levels.get(guild_id)
+        if guild is None:
+            guild = self.levels[guild_id] = {"server_name": guild_name, "members": MemberTable()}
+        guild["server_name"] = guild_name
+        ranking = self.rankings.get(guild_id)
+        for member_id, xp, level in records:
+            if ranking is not None:
+                ranking.update(member_id, guild["members"].get(member_id), xp, level)
+            guild["members"].set(member_id, xp, level)
+        self.mark_dirty(guild_id)
+
+    def update_server_name(self, guild_id, name):
+        guild = self.levels.get(str(guild_id))
+        if guild is None or guild["server_name"] == name:
+            return False
+        guild["server_name"] = name
+        self.mark_dirty(str(guild_id))
+        return True
+
+    def member_count(self, guild_id):
+        guild = self.levels.get(str(guild_id))
+        return len(guild["members"]) if guild else 0
+
+    def iter_guilds(self):
+        for guild_id, guild in list(self.levels.items()):
+            yield guild_id, guild["server_name"]
+
+    def iter_members(self, guild_id):
+        guild = self.levels.get(str(guild_id))
+        if guild is None:
+            return
+        for member_id, xp, level in list(guild["members"].items()):
+            yield str(member_id), xp, level
+
+    def ranking(self, guild_id):
+        guild_id = str(guild_id)
+        ranking = self.rankings.get(guild_id)
+        if ranking is None:
+            guild = self.levels.get(guild_id)
+            members = guild["members"].items() if guild else ()
+            ranking = self.rankings[guild_id] = RankIndex(members)
+        return ranking
+
+    async def rank_member(self, guild_id, member_id):
+        ranking = self.ranking(guild_id)
+        record = self.get_member(guild_id, member_id)
+        if record is None:
+            return None, len(ranking)
+        return ranking.rank(member_id, record["xp"], record["level"]), len(ranking)
+
+    async def top_members(self, guild_id, limit, offset=0):
+        return self.ranking(guild_id).top(limit, offset)
+
+    async def save(self):
+        async with self.save_lock:
+            if not self.dirty_guilds:
+                return
+
+            for guild_id in self.dirty_guilds:
+                self.guild_payloads[guild_id] = self.dump_guild(guild_id)
+            self.dirty_guilds.clear()
+            self.dirty_changes = 0
+
+            payloads = list(self.guild_payloads.items())
+            try:
+                await asyncio.to_thread(self.write_levels, payloads)
+            except OSError as e:
+                print(f"[LEVELING] Error saving levels: {e}")
+                self.dirty_guilds.update(guild_id for guild_id, _ in payloads)
+
+    def write_levels(self, payloads):
+        body = ",".join(f"{json.dumps(guild_id)}:{payload}" for guild_id, payload in payloads)
+        write_atomic(self.path, "{" + body + "}")
+
+    def close(self):
+        pass
+
+
+class SQLiteLevelStore:
+    # One row per (guild_id, member_id) in LEVELS_DB. XP changes are buffered
+    # in memory and applied by save() as batched upserts in a single transaction.
+    # A save only writes the buffered rows, so bulk writers can save as they go.
+    incremental_saves = True
+
+    def __init__(self, path=LEVELS_DB, json_path=LEVELS_FILE):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # The writer connection is only used from the save thread, reads use their own connection
+        self.writer = sqlite3.connect(path, check_same_thread=False)
+        self.writer.execute("PRAGMA journal_mode=WAL")
+        self.writer.execute("PRAGMA synchronous=NORMAL")
+        self.create_tables()
+        self.reader = sqlite3.connect(path, check_same_thread=False)
+        self.write_lock = threading.Lock()
+        self.pending_members = {}
+        self.pending_names = {}
+        # Batch currently being written, still served to readers until it is committed
+        self.saving_members = {}
+        self.dirty_changes = 0
+        self.save_lock = asyncio.Lock()
+        if not self.writer.execute("SELECT 1 FROM meta WHERE key = 'imported_json'").fetchone():
+            self.import_json(json_path)
+
+    def create_tables(self):
+        with self.writer:
+            self.writer.executescript("""
+                CREATE TABLE IF NOT EXISTS guilds (
+                    guild_id INTEGER PRIMARY KEY,
+                    server_name TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS members (
+                    guild_id INTEGER NOT NULL,
+                    member_id INTEGER NOT NULL,
+                    xp INTEGER NOT NULL,
+                    level INTEGER NOT NULL,
+                    PRIMARY KEY (guild_id, member_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS members_rank ON members (guild_id, level DESC, xp DESC);
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            """)
+
+    def import_json(self, json_path):
+        levels = load_levels_file(json_path)
+        with self.writer:
+            for guild_id, guild in levels.items():
+                self.writer.execute(
+                    "INSERT OR REPLACE INTO guilds (guild_id, server_name) VALUES (?, ?)",
+                    (int(guild_id), guild.get("server_name", "Unknown"))
+                )
+                self.writer.executemany(
+                    "INSERT OR REPLACE INTO members (guild_id, member_id, xp, level) VALUES (?, ?, ?, ?)",
+                    ((int(guild_id), int(member_id), data["xp"], data["level"])
+                     for member_id, data in guild.get("members", {}).items())
+                )
+            self.writer.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('imported_json', ?)", (json_path,))
+
+        if levels:
+            print(f"{Fore.CYAN}[LEVELING] Imported {len(levels)} servers from {json_path} into {self.path}")
+
+    def get_member(self, guild_id, member_id):
+        key = (int(guild_id), int(member_id))
+        record = self.pending_members.get(key) or self.saving_members.get(key)
+        if record is not None:
+            return {"xp": record[0], "level": record[1]}
+
+        row = self.reader.execute(
+            "SELECT xp, level FROM members WHERE guild_id = ? AND member_id = ?", key
+        ).fetchone()
+        return {"xp": row[0], "level": row[1]} if row else None
+
+    def update_member(self, guild_id, guild_name, member_id, xp, level):
+        guild_id = int(guild_id)
+        self.pending_members[(guild_id, int(member_id))] = (xp, level)
+        self.pending_names[guild_id] = guild_name
+        self.dirty_changes += 1
+
+    def update_members(self, guild_id, guild_name, records):
+        # records is an iterable of (member_id, xp, level)
+        guild_id = int(guild_id)
+        self.pending_names[guild_id] = guild_name
+        for member_id, xp, level in records:
+            self.pending_members[(guild_id, int(member_id))] = (xp, level)
+        self.dirty_changes += 1
+
+    def update_server_name(self, guild_id, name):
+        guild_id = int(guild_id)
+        row = self.reader.execute("SELECT server_name FROM guilds WHERE guild_id = ?", (guild_id,)).fetchone()
+        if row is None or row[0] == name:
+            return False
+        self.pending_names[guild_id] = name
+        self.dirty_changes += 1
+        return True
+
+    def member_count(self, guild_id):
+        return self.reader.execute(
+            "SELECT COUNT(*) FROM members WHERE guild_id = ?", (int(guild_id),)
+        ).fetchone()[0]
+
+    # The iterators open their own connection so they can be consumed from a worker thread,
+    # call save() first to include buffered XP
+    def iter_guilds(self):
+        db = sqlite3.connect(self.path)
+        try:
+            for guild_id, server_name in db.execute("SELECT guild_id, server_name FROM guilds"):
+                yield str(guild_id), server_name
+        finally:
+            db.close()
+
+    def iter_members(self, guild_id):
+        db = sqlite3.connect(self.path)
+        try:
+            rows = db.execute("SELECT member_id, xp, level FROM members WHERE guild_id = ?", (int(guild_id),))
+            for member_id, xp, level in rows:
+                yield str(member_id), xp, level
+        finally:
+            db.close()
+
+    # Rankings are answered from the members_rank index instead of being held in memory,
+    # buffered XP is saved first so they match what /level reports
+    async def rank_member(self, guild_id, member_id):
+        await self.save()
+        guild_id = int(guild_id)
+        total = self.member_count(guild_id)
+        row = self.reader.execute(
+            "SELECT xp, level FROM members WHERE guild_id = ? AND member_id = ?", (guild_id, int(member_id))
+        ).fetchone()
+        if row is None:
+            return None, total
+        xp, level = row
+        ahead = self.reader.execute(
+            "SELECT COUNT(*) FROM members WHERE guild_id = ? "
+            "AND (level > ? OR (level = ? AND (xp > ? OR (xp = ? AND member_id < ?))))",
+            (guild_id, level, level, xp, xp, int(member_id))
+        ).fetchone()[0]
+        return ahead + 1, total
+
+    async def top_members(self, guild_id, limit, offset=0):
+        await self.save()
+        rows = self.reader.execute(
+            "SELECT member_id, xp, level FROM members WHERE guild_id = ? "
+            "ORDER BY level DESC, xp DESC, member_id LIMIT ? OFFSET ?",
+            (int(guild_id), limit, offset)
+        ).fetchall()
+        return [(str(member_id), xp, level) for member_id, xp, level in rows]
+
+    async def save(self):
+        async with self.save_lock:
+            if not self.pending_members and not self.pending_names:
+                return
+
+            self.saving_members, self.pending_members = self.pending_members, {}
+            names, self.pending_names = self.pending_names, {}
+            self.dirty_changes = 0
+            try:
+                await asyncio.to_thread(self.write_batch, self.saving_members, names)
+            except sqlite3.Error as e:
+                print(f"[LEVELING] Error saving levels: {e}")
+                for key, record in self.saving_members.items():
+                    self.pending_members.setdefault(key, record)
+                for guild_id, name in names.items():
+                    self.pending_names.setdefault(guild_id, name)
+            finally:
+                self.saving_members = {}
+
+    def write_batch(self, members, names):
+        with self.write_lock, self.writer:
+            self.writer.executemany(
+                "INSERT INTO guilds (guild_id, server_name) VALUES (?, ?) "
+                "ON CONFLICT (guild_id) DO UPDATE SET server_name = excluded.server_name",
+                names.items()
+            )
+            self.writer.executemany(
+                "INSERT INTO members (guild_id, member_id, xp, level) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (guild_id, member_id) DO UPDATE SET xp = excluded.xp, level = excluded.level",
+                ((guild_id, member_id, xp, level) for (guild_id, member_id), (xp, level) in members.items())
+            )
+
+    def close(self):
+        # Never close the writer in the middle of a batch written by a save thread
+        with self.write_lock:
+            self.reader.close()
+            self.writer.close()
+
+
+def create_level_store():
+    if LEVELS_BACKEND == "sqlite":
+        return SQLiteLevelStore()
+    return JSONLevelStore()
@@ -0,0 +1,53 @@
+from array import array
+
+
+class MemberTable:
+    # XP and level of one guild's members kept in parallel typed arrays with an
+    # id -> row map, instead of a {"member_id": {"xp": ..., "level": ...}} dict per member.
+    __slots__ = ("ids", "xp", "levels", "rows")
+
+    def __init__(self, members=()):
+        self.ids = array("Q")
+        self.xp = array("q")
+        self.levels = array("l")
+        self.rows = {}
+        for member_id, xp, level in members:
+            self.set(member_id, xp, level)
+
+    @classmethod
+    def from_json(cls, members):
+        return cls((int(member_id), data["xp"], data["level"]) for member_id, data in members.items())
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, member_id):
+        return int(member_id) in self.rows
+
+    def get(self, member_id):
+        row = self.rows.get(int(member_id))
+        if row is None:
+            return None
+        return self.xp[row], self.levels[row]
+
+    def set(self, member_id, xp, level):
+        member_id = int(member_id)
+        row = self.rows.get(member_id)
+        if row is None:
+            self.rows[member_id] = len(self.ids)
+            self.ids.append(member_id)
+            self.xp.append(xp)
+            self.levels.append(level)
+        else:
+            self.xp[row] = xp
+            self.levels[row] = level
+
+    def items(self):
+        # Yields (member_id, xp, level), ids as ints
+        return zip(self.ids, self.xp, self.levels)
+
+    def to_json(self):
+        # Same layout levels.json always had, built without intermediate dicts
+        return "{" + ",".join(
+            f'"{member_id}":{{"xp":{xp},"level":{level}}}' for member_id, xp, level in self.items()
+        ) + "}"
@@ -0,0 +1,47 @@
+from sortedcontainers import SortedList
+
+XP_BITS = 40
+ID_BITS = 64
+ID_MASK = (1 << ID_BITS) - 1
+
+
+def rank_key(member_id, xp, level):
+    # One int per member: ascending order is level and xp descending, then member id
+    return int(member_id) - (((level << XP_BITS) | xp) << ID_BITS)
+
+
+class RankIndex:
+    # Members of one guild ordered by (level, xp), highest first, stored as packed
+    # ints with no per-member dict. Callers pass the member's current (xp, level),
+    # which the MemberTable already holds. Updates, top-N slices and rank lookups are O(log n).
+    def __init__(self, members=()):
+        self.ranking = SortedList(rank_key(member_id, xp, level) for member_id, xp, level in members)
+
+    def __len__(self):
+        return len(self.ranking)
+
+    def update(self, member_id, old, xp, level):
+        # old is the member's previous (xp, level), None for a new member
+        if old is not None:
+            if old == (xp, level):
+                return
+            self.ranking.discard(rank_key(member_id, *old))
+        self.ranking.add(rank_key(member_id, xp, level))
+
+    def remove(self, member_id, xp, level):
+        self.ranking.discard(rank_key(member_id, xp, level))
+
+    def rank(self, member_id, xp, level):
+        key = rank_key(member_id, xp, level)
+        index = self.ranking.bisect_left(key)
+        if index == len(self.ranking) or self.ranking[index] != key:
+            return None
+        return index + 1
+
+    def top(self, limit, offset=0):
+        entries = []
+        for key in self.ranking.islice(offset, offset + limit):
+            member_id = key & ID_MASK
+            score = (member_id - key) >> ID_BITS
+            entries.append((str(member_id), score & ((1 << XP_BITS) - 1), score >> XP_BITS))
+        return entries
@@ -0,0 +1,133 @@
+import asyncio
+import itertools
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config import RENDER_WORKERS, RENDER_QUEUE_SIZE
+
+# Lower numbers are rendered first
+PRIORITY_CARDS = 0
+PRIORITY_COMMANDS = 1
+
+
+class RenderQueueFull(Exception):
+    pass
+
+
+def warm_worker():
+    # Runs once in every worker process so the first welcome card and filter are as fast as the rest
+    from utils.cards import welcome_card_template
+    from utils.filters import preload_overlays
+    try:
+        welcome_card_template()
+        preload_overlays()
+    except OSError:
+        pass
+
+
+class RenderService:
+    # Runs Pillow jobs in a process pool so CPU-heavy renders never hold the
+    # event loop (and the gateway heartbeat). Jobs wait in a bounded priority
+    # queue and are handed to the pool at most one per worker at a time.
+    def __init__(self, workers=RENDER_WORKERS, max_queue=RENDER_QUEUE_SIZE):
+        self.workers = workers
+        self.queue = asyncio.PriorityQueue(max_queue)
+        self.sequence = itertools.count()
+        self.executor = self.create_executor()
+        self.consumers = [asyncio.create_task(self.consume()) for _ in range(workers)]
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.running = 0
+        self.latencies = deque(maxlen=200)
+        self.waits = deque(maxlen=200)
+
+    def create_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=warm_worker
+        )
+
+    async def render(self, function, *args, priority=PRIORITY_COMMANDS):
+        # function must be a module-level function taking and returning plain data
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((priority, next(self.sequence), function, args, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise RenderQueueFull("The image renderer is busy, please try again in a moment.")
+        return await future
+
+    async def consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            _, _, function, args, future, queued_at = await self.queue.get()
+            if future.cancelled():
+                continue
+            started = time.perf_counter()
+            self.waits.append(started - queued_at)
+            self.running += 1
+            executor = self.executor
+            try:
+                result = await loop.run_in_executor(executor, function, *args)
+            except BrokenProcessPool as e:
+                # A worker died (out of memory, killed), start a fresh pool for the next jobs.
+                # Every job on the broken pool lands here, only the first one replaces it.
+                if self.executor is executor:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    self.executor = self.create_executor()
+                self.fail(future, e)
+            except asyncio.CancelledError as e:
+                # The job was cancelled inside the pool, only stop if this consumer itself is being cancelled
+                if asyncio.current_task().cancelling():
+                    raise
+                self.fail(future, e)
+            except Exception as e:
+                self.fail(future, e)
+            else:
+                self.completed += 1
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self.running -= 1
+                self.latencies.append(time.perf_counter() - started)
+
+    def fail(self, future, error):
+        self.failed += 1
+        if not future.done():
+            future.set_exception(error)
+
+    def stats(self):
+        def percentile(values, fraction):
+            if not values:
+                return 0.0
+            ordered = sorted(values)
+            return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+        return {
+            "workers": self.workers,
+            "queued": self.queue.qsize(),
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "render_p50": percentile(self.latencies, 0.5),
+            "render_p95": percentile(self.latencies, 0.95),
+            "wait_p95": percentile(self.waits, 0.95)
+        }
+
+    async def close(self):
+        for consumer in self.consumers:
+            consumer.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_render_service(bot):
+    service = getattr(bot, "render_service", None)
+    if service is None:
+        service = RenderService()
+        bot.render_service = service
+    return service
@@ -0,0 +1,56 @@
+import asyncio
+import time
+import discord
+from config import USER_CACHE_TTL
+
+
+class UserCache:
+    # Short-lived cache in front of bot.fetch_user so repeated lookups
+    # (leaderboards, paging) don't cost a REST round-trip each time.
+    def __init__(self, bot, ttl=USER_CACHE_TTL):
+        self.bot = bot
+        self.ttl = ttl
+        self.users = {}
+
+    def get(self, user_id):
+        user = self.bot.get_user(user_id)
+        if user is not None:
+            return user
+
+        entry = self.users.get(user_id)
+        if entry is None:
+            return None
+        user, expires = entry
+        if expires < time.monotonic():
+            del self.users[user_id]
+            return None
+        return user
+
+    async def fetch(self, user_id):
+        user = self.get(user_id)
+        if user is not None:
+            return user
+        try:
+            user = await self.bot.fetch_user(user_id)
+        except (discord.NotFound, discord.HTTPException):
+            return None
+        self.users[user_id] = (user, time.monotonic() + self.ttl)
+        return user
+
+    async def fetch_many(self, user_ids):
+        users = await asyncio.gather(*(self.fetch(user_id) for user_id in user_ids))
+        self.prune()
+        return dict(zip(user_ids, users))
+
+    def prune(self):
+        now = time.monotonic()
+        for user_id in [user_id for user_id, (_, expires) in self.users.items() if expires < now]:
+            del self.users[user_id]
+
+
+def get_user_cache(bot):
+    cache = getattr(bot, "user_cache", None)
+    if cache is None:
+        cache = UserCache(bot)
+        bot.user_cache = cache
+    return cache
@@ -0,0 +1,69 @@
+import asyncio
+import aiohttp
+from config import HTTP_TIMEOUT, AVATAR_MAX_BYTES, AVATAR_CACHE_BYTES
+from utils.bytecache import ByteLRU
+
+
+class DownloadTooLarge(Exception):
+    pass
+
+
+class WebClient:
+    # One pooled aiohttp session for every cog, plus an LRU cache of avatar
+    # bytes keyed by the avatar hash so repeat renders skip the download.
+    def __init__(self, timeout=HTTP_TIMEOUT, max_bytes=AVATAR_MAX_BYTES, cache_bytes=AVATAR_CACHE_BYTES):
+        self.timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=timeout / 2)
+        self.max_bytes = max_bytes
+        self.cache = ByteLRU(cache_bytes)
+        self.session = None
+        self.session_lock = asyncio.Lock()
+
+    async def get_session(self):
+        async with self.session_lock:
+            if self.session is None or self.session.closed:
+                connector = aiohttp.TCPConnector(limit=50, limit_per_host=20, ttl_dns_cache=300)
+                self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            return self.session
+
+    async def fetch_bytes(self, url, max_bytes=None):
+        max_bytes = max_bytes or self.max_bytes
+        session = await self.get_session()
+        async with session.get(url) as response:
+            response.raise_for_status()
+            if response.content_length and response.content_length > max_bytes:
+                raise DownloadTooLarge(f"{url} is {response.content_length} bytes, the limit is {max_bytes}")
+            data = bytearray()
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                data.extend(chunk)
+                if len(data) > max_bytes:
+                    raise DownloadTooLarge(f"{url} is larger than {max_bytes} bytes")
+            return bytes(data)
+
+    async def fetch_avatar(self, asset, size=512, format=None):
+        # asset.key is the avatar hash, so a new avatar is a new cache entry.
+        # Without a format animated avatars stay animated and static ones come as PNG.
+        key = (asset.key, size, format)
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+
+        if format:
+            asset = asset.replace(size=size, format=format)
+        else:
+            asset = asset.replace(size=size, static_format="png")
+        data = await self.fetch_bytes(asset.url)
+        self.cache.put(key, data)
+        return data
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+
+
+def get_web_client(bot):
+    # Not bot.http, that name belongs to discord.py's own REST client
+    client = getattr(bot, "web_client", None)
+    if client is None:
+        client = WebClient()
+        bot.web_client = client
+    return client